@@ -0,0 +1,521 @@
+# App Runtime - Shared Session, Lazy Imports and Startup Timing
+# Shared by the landing page and the sample apps. The Snowpark session is only created
+# (and Snowpark only imported) when an app first asks for it, heavy modules such as pandas
+# are imported on first attribute access, and each app's startup is timed per process.
+# Set APP_RUNTIME_PROFILE=1 to print each app's startup breakdown to stderr.
+#
+# Outside Streamlit in Snowflake there is no active session; the apps then share a bounded
+# pool of sessions logged in with snowflake-connector-python, configured from the
+# [connections.snowflake] section of .streamlit/secrets.toml or SNOWFLAKE_* environment variables.
+
+import importlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import streamlit as st
+
+# Print the startup breakdown of every app on its first run in the process
+APP_RUNTIME_PROFILE = os.environ.get("APP_RUNTIME_PROFILE", "") not in ("", "0")
+
+# Session pool used when there is no active session. min_size sessions are logged in at
+# boot; idle sessions beyond that are closed after the idle timeout, and a session that
+# sat idle longer than the health check interval is probed before it is handed out.
+SESSION_POOL_MAX_SIZE = int(os.environ.get("SESSION_POOL_MAX_SIZE", "4"))
+SESSION_POOL_MIN_SIZE = int(os.environ.get("SESSION_POOL_MIN_SIZE", "1"))
+SESSION_POOL_IDLE_SECONDS = 600
+SESSION_POOL_HEALTH_CHECK_SECONDS = 60
+SESSION_POOL_ACQUIRE_TIMEOUT_SECONDS = 30
+SESSION_POOL_HEALTH_CHECK_QUERY = "SELECT 1"
+# Errors that can leave a session's connection unusable (type names, so neither driver
+# has to be imported). A failed statement, e.g. a ProgrammingError or SnowparkSQLException,
+# leaves the connection fine and the session goes straight back to the pool.
+SESSION_POOL_CONNECTION_ERRORS = {"OperationalError", "InterfaceError", "DatabaseError", "SnowparkSessionException"}
+SESSION_POOL_RECENT_WAITS = 500
+
+# Connection settings read from SNOWFLAKE_<NAME> environment variables when secrets are not set
+SNOWFLAKE_CONNECTION_SETTINGS = [
+    "account", "user", "password", "authenticator", "private_key_file",
+    "role", "warehouse", "database", "schema"
+]
+
+_current_app = threading.local()
+
+class StartupTimings:
+    """Per-app import and startup timing breakdown, kept for the life of the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._apps = {}
+
+    def _app(self, app):
+        return self._apps.setdefault(app, {
+            "imports": {},
+            "session_seconds": None,
+            "first_run_seconds": None,
+            "last_run_seconds": None,
+            "runs": 0
+        })
+
+    def record_import(self, app, module, seconds):
+        with self._lock:
+            self._app(app)["imports"][module] = seconds
+
+    def record_session(self, app, seconds):
+        with self._lock:
+            self._app(app)["session_seconds"] = seconds
+
+    def record_run(self, app, seconds):
+        """Record one script run; returns True for the first run of the app in this process"""
+        with self._lock:
+            timings = self._app(app)
+            timings["runs"] += 1
+            timings["last_run_seconds"] = seconds
+            if timings["first_run_seconds"] is None:
+                timings["first_run_seconds"] = seconds
+                return True
+            return False
+
+    def breakdown(self, app):
+        """Timing breakdown for one app, or None if it has not run yet"""
+        with self._lock:
+            timings = self._apps.get(app)
+            if timings is None:
+                return None
+            return dict(timings, imports=dict(timings["imports"]))
+
+    def summary(self):
+        """One row per app, for display"""
+        with self._lock:
+            return [
+                {
+                    "app": app,
+                    "runs": timings["runs"],
+                    "first_run_ms": round((timings["first_run_seconds"] or 0.0) * 1000, 1),
+                    "last_run_ms": round((timings["last_run_seconds"] or 0.0) * 1000, 1),
+                    "imports_ms": round(sum(timings["imports"].values()) * 1000, 1),
+                    "session_ms": round((timings["session_seconds"] or 0.0) * 1000, 1),
+                    "imported": ", ".join(timings["imports"])
+                }
+                for app, timings in self._apps.items()
+            ]
+
+@st.cache_resource
+def get_startup_timings():
+    """Process-wide startup timings shared by every app"""
+    return StartupTimings()
+
+def current_app():
+    return getattr(_current_app, "name", None) or "unknown"
+
+def timed_import(name):
+    """Import a module, recording the time against the running app if it was not loaded yet"""
+    if name in sys.modules:
+        return sys.modules[name]
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    get_startup_timings().record_import(current_app(), name, time.perf_counter() - started)
+    return module
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name):
+    """Return a module proxy; the real import happens when the app first uses it"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+class PoolWaiter:
+    """A blocked acquire(): woken with a handed-over session, or a free slot to create one in"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.session = None
+        self.create = False
+
+class SessionPool:
+    """
+    Bounded, thread-safe pool of sessions. Sessions are created on demand up to max_size
+    (callers wait when all are leased), probed with a health check query when they sat
+    idle for a while, and closed once idle for longer than idle_seconds. Also keeps
+    utilization and wait-time metrics. Works with any object with sql() and close(),
+    so it can be exercised against local_session.LocalSession.
+    """
+
+    def __init__(self, factory, max_size, min_size=0, idle_seconds=SESSION_POOL_IDLE_SECONDS,
+                 health_check_seconds=SESSION_POOL_HEALTH_CHECK_SECONDS,
+                 acquire_timeout=SESSION_POOL_ACQUIRE_TIMEOUT_SECONDS):
+        self.factory = factory
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.idle_seconds = idle_seconds
+        self.health_check_seconds = health_check_seconds
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+        self._waiters = deque()   # PoolWaiter per blocked acquire(), oldest first
+        self._idle = deque()      # (session, idle since), most recently released last
+        self._size = 0            # sessions open or being created
+        self._in_use = 0
+        self._started = time.monotonic()
+        self._busy_since = self._started
+        self._busy_seconds = 0.0  # integral of sessions in use over time
+        self._waits = deque(maxlen=SESSION_POOL_RECENT_WAITS)
+        self.peak_in_use = 0
+        self.acquisitions = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.created = 0
+        self.login_seconds = 0.0
+        self.evicted = 0
+        self.failed_health_checks = 0
+
+    def _track_busy(self):
+        """Accumulate in-use session time; called with the lock held before _in_use changes"""
+        now = time.monotonic()
+        self._busy_seconds += self._in_use * (now - self._busy_since)
+        self._busy_since = now
+
+    def _take_expired(self):
+        """Remove sessions idle past the timeout (keeping min_size open); called with the lock held"""
+        now = time.monotonic()
+        expired = []
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_seconds:
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+            self.evicted += 1
+        return expired
+
+    @staticmethod
+    def _close(sessions):
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    def _healthy(self, session):
+        try:
+            session.sql(SESSION_POOL_HEALTH_CHECK_QUERY).collect()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """
+        Lease a session, waiting up to acquire_timeout when the pool is exhausted.
+        Waiters are served first come, first served: a released session is handed
+        straight to the longest waiting caller.
+        """
+        requested = time.monotonic()
+        deadline = requested + self.acquire_timeout
+        while True:
+            waiter = None
+            needs_check = False
+            with self._lock:
+                expired = self._take_expired()
+                if self._idle and not self._waiters:
+                    # Most recently used first, so surplus sessions age out
+                    session, idle_since = self._idle.pop()
+                    create = False
+                    needs_check = time.monotonic() - idle_since > self.health_check_seconds
+                elif self._size < self.max_size and not self._waiters:
+                    self._size += 1
+                    session, create = None, True
+                else:
+                    waiter = PoolWaiter()
+                    self._waiters.append(waiter)
+                if waiter is None:
+                    self._track_busy()
+                    self._in_use += 1
+                    self.peak_in_use = max(self.peak_in_use, self._in_use)
+            self._close(expired)
+            
+            if waiter is not None:
+                waiter.event.wait(max(0.0, deadline - time.monotonic()))
+                with self._lock:
+                    if not waiter.event.is_set():
+                        self._waiters.remove(waiter)
+                        self.timeouts += 1
+                        raise TimeoutError(f"No session available within {self.acquire_timeout} seconds")
+                # Handed over by release() (just used, no check needed) or a freed slot from _discard()
+                session, create = waiter.session, waiter.create
+            
+            # Wait time covers queueing for a session or a free slot, not the login itself
+            waited = time.monotonic() - requested
+            if create:
+                login_started = time.monotonic()
+                try:
+                    session = self.factory()
+                except Exception:
+                    self._discard()
+                    raise
+                with self._lock:
+                    self.created += 1
+                    self.login_seconds += time.monotonic() - login_started
+            elif needs_check and not self._healthy(session):
+                with self._lock:
+                    self.failed_health_checks += 1
+                self._discard(session)
+                continue
+            
+            with self._lock:
+                self.acquisitions += 1
+                self._waits.append(waited)
+                if waiter is not None:
+                    self.waited += 1
+            return session
+
+    def _discard(self, session=None):
+        """Drop a leased session (or a failed creation) from the pool, passing its slot to a waiter"""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.create = True
+                waiter.event.set()
+            else:
+                self._track_busy()
+                self._in_use -= 1
+                self._size -= 1
+        if session is not None:
+            self._close([session])
+
+    def release(self, session, broken=False):
+        """Return a leased session; broken sessions are closed instead of reused"""
+        if broken:
+            self._discard(session)
+            return
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.session = session
+                waiter.event.set()
+            else:
+                self._track_busy()
+                self._in_use -= 1
+                self._idle.append((session, time.monotonic()))
+
+    @contextmanager
+    def lease(self):
+        """Lease a session for the duration of a with block"""
+        session = self.acquire()
+        try:
+            yield session
+        except Exception as error:
+            # Only a connection-level error can leave the session unusable; let the health check decide
+            self.release(session, broken=is_connection_error(error) and not self._healthy(session))
+            raise
+        else:
+            self.release(session)
+
+    def warm_up(self, count=None):
+        """Log in sessions up front (min_size by default) so the first requests do not wait for it"""
+        count = self.min_size if count is None else min(count, self.max_size)
+        sessions = []
+        try:
+            for _ in range(max(0, count - self.stats()["open"])):
+                sessions.append(self.acquire())
+        finally:
+            for session in sessions:
+                self.release(session)
+
+    def close(self):
+        """Close every idle session"""
+        with self._lock:
+            sessions = [session for session, _ in self._idle]
+            self._size -= len(sessions)
+            self._idle.clear()
+        self._close(sessions)
+
+    def stats(self):
+        """Return pool size, utilization and wait-time metrics for display"""
+        with self._lock:
+            expired = self._take_expired()
+            self._track_busy()
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            waits = sorted(self._waits)
+            stats = {
+                "open": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "utilization": self._in_use / self.max_size,
+                "average_utilization": self._busy_seconds / (self.max_size * elapsed),
+                "peak_in_use": self.peak_in_use,
+                "acquisitions": self.acquisitions,
+                "waited": self.waited,
+                "timeouts": self.timeouts,
+                "wait_p50_ms": 1000 * waits[len(waits) // 2] if waits else 0.0,
+                "wait_p95_ms": 1000 * waits[int(len(waits) * 0.95)] if waits else 0.0,
+                "wait_max_ms": 1000 * waits[-1] if waits else 0.0,
+                "created": self.created,
+                "login_avg_ms": 1000 * self.login_seconds / self.created if self.created else 0.0,
+                "evicted": self.evicted,
+                "failed_health_checks": self.failed_health_checks
+            }
+        self._close(expired)
+        return stats
+
+class PooledAsyncJob:
+    """Async query job run on a pooled session; mirrors snowflake.snowpark.AsyncJob"""
+
+    def __init__(self, future):
+        self._future = future
+
+    def is_done(self):
+        return self._future.done()
+
+    def result(self):
+        return self._future.result()
+
+class PooledQuery:
+    """A query whose every execution leases a session from the pool for its duration"""
+
+    def __init__(self, pool, executor, query, params):
+        self._pool = pool
+        self._executor = executor
+        self._query = query
+        self._params = params
+
+    def _run(self, fetch):
+        with self._pool.lease() as session:
+            if self._params is None:
+                return fetch(session.sql(self._query))
+            return fetch(session.sql(self._query, params=self._params))
+
+    def collect(self):
+        return self._run(lambda dataframe: dataframe.collect())
+
+    def to_pandas(self):
+        return self._run(lambda dataframe: dataframe.to_pandas())
+
+    def collect_nowait(self):
+        return PooledAsyncJob(self._executor.submit(self.collect))
+
+    @property
+    def schema(self):
+        return self._run(lambda dataframe: dataframe.schema)
+
+class PooledSession:
+    """
+    Stands in for a Snowpark session on top of a SessionPool, so apps can call
+    session.sql(...) as usual. It only supports sql(): DataFrames from session.table()
+    and file operations stay bound to their session, so they need one leased for as
+    long as they are used - see leased_session().
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(max_workers=pool.max_size, thread_name_prefix="pooled-session")
+
+    def sql(self, query, params=None):
+        return PooledQuery(self.pool, self._executor, query, params)
+
+    @contextmanager
+    def lease(self):
+        """Lease a Snowpark session from the pool for the duration of a with block"""
+        with self.pool.lease() as session:
+            yield session
+
+def is_connection_error(error):
+    """True if error may have left the session's connection unusable (see SESSION_POOL_CONNECTION_ERRORS)"""
+    return isinstance(error, OSError) or type(error).__name__ in SESSION_POOL_CONNECTION_ERRORS
+
+@contextmanager
+def leased_session(session):
+    """
+    A Snowpark session to build and run DataFrames (session.table(), session.file, ...)
+    on within a with block. A PooledSession (or a wrapper around one) leases a session
+    for the whole block, so the DataFrames run before it goes back to the pool; any
+    other session is used as is.
+    """
+    lease = getattr(session, "lease", None)
+    if lease is None:
+        yield session
+        return
+    with lease() as leased:
+        yield leased
+
+def snowflake_connection_parameters():
+    """Connection settings from secrets ([connections.snowflake]) or SNOWFLAKE_* environment variables"""
+    try:
+        parameters = dict(st.secrets["connections"]["snowflake"])
+    except Exception:
+        parameters = {}
+    if not parameters:
+        for name in SNOWFLAKE_CONNECTION_SETTINGS:
+            value = os.environ.get(f"SNOWFLAKE_{name.upper()}")
+            if value:
+                parameters[name] = value
+    if not parameters:
+        raise RuntimeError(
+            "No active Snowflake session and no connection settings found; "
+            "configure [connections.snowflake] in secrets.toml or SNOWFLAKE_* environment variables"
+        )
+    return parameters
+
+def create_pooled_session():
+    """Log in with snowflake-connector-python and wrap the connection in a Snowpark session"""
+    connector = timed_import("snowflake.connector")
+    snowpark = timed_import("snowflake.snowpark")
+    connection = connector.connect(**snowflake_connection_parameters())
+    return snowpark.Session.builder.configs({"connection": connection}).create()
+
+@st.cache_resource
+def get_session_pool():
+    """Process-wide session pool, warmed up to SESSION_POOL_MIN_SIZE sessions on creation"""
+    pool = SessionPool(create_pooled_session, SESSION_POOL_MAX_SIZE, SESSION_POOL_MIN_SIZE)
+    pool.warm_up()
+    return pool
+
+# Initialize Snowflake session
+@st.cache_resource
+def init_connection():
+    """
+    Initialize connection to Snowflake, importing Snowpark on first use. Inside Streamlit
+    in Snowflake this is the active session; elsewhere, a PooledSession.
+    """
+    started = time.perf_counter()
+    context = timed_import("snowflake.snowpark.context")
+    exceptions = timed_import("snowflake.snowpark.exceptions")
+    try:
+        session = context.get_active_session()
+    except exceptions.SnowparkSessionException:
+        session = PooledSession(get_session_pool())
+    get_startup_timings().record_session(current_app(), time.perf_counter() - started)
+    return session
+
+def run_app(name, main):
+    """Run an app's main() and record its run time; imports it triggers are attributed to it"""
+    _current_app.name = name
+    started = time.perf_counter()
+    try:
+        main()
+    finally:
+        elapsed = time.perf_counter() - started
+        first_run = get_startup_timings().record_run(name, elapsed)
+        _current_app.name = None
+        if first_run and APP_RUNTIME_PROFILE:
+            print(f"[app_runtime] {name} startup: {get_startup_timings().breakdown(name)}", file=sys.stderr)
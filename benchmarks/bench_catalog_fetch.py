@@ -0,0 +1,174 @@
+# Catalog Fetch Benchmark
+# Compares the original catalog load path (SELECT * -> collect() -> Row.asDict() per row ->
+# per-row field lookups -> DataFrame from a list of dicts) with the projected Arrow path
+# (only the used columns -> to_pandas() -> one vectorized normalization) on a synthetic catalog.
+#
+# Usage: python benchmarks/bench_catalog_fetch.py [--apps 50000] [--repeat 5]
+
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import streamlit_landing_page as landing_page
+
+try:
+    from snowflake.snowpark import Row
+except ImportError:
+    class Row(tuple):
+        """Minimal stand-in for snowflake.snowpark.Row"""
+
+        def __new__(cls, **kwargs):
+            row = tuple.__new__(cls, kwargs.values())
+            row._fields = list(kwargs)
+            return row
+
+        def asDict(self):
+            return dict(zip(self._fields, self))
+
+# Columns returned by SHOW STREAMLITS / INFORMATION_SCHEMA.STREAMLITS style views
+SYNTHETIC_COLUMNS = [
+    "CREATED_ON", "NAME", "DATABASE_NAME", "SCHEMA_NAME", "TITLE", "OWNER", "COMMENT",
+    "QUERY_WAREHOUSE", "URL_ID", "OWNER_ROLE_TYPE", "ROOT_LOCATION", "MAIN_FILE",
+    "LAST_ALTERED", "IMPORT_URLS"
+]
+
+def build_synthetic_catalog(app_count):
+    """Build a synthetic full-width catalog as an Arrow table"""
+    now = datetime.now()
+    return pa.table({
+        "CREATED_ON": [now - timedelta(minutes=i) for i in range(app_count)],
+        "NAME": [f"APP_{i:06d}" for i in range(app_count)],
+        "DATABASE_NAME": [f"DB_{i % 40}" for i in range(app_count)],
+        "SCHEMA_NAME": [f"SCHEMA_{i % 300}" for i in range(app_count)],
+        "TITLE": [f"Application {i}" if i % 7 else None for i in range(app_count)],
+        "OWNER": [f"TEAM_{i % 25}" for i in range(app_count)],
+        "COMMENT": [f"Synthetic Streamlit application number {i} used for benchmarking" for i in range(app_count)],
+        "QUERY_WAREHOUSE": ["COMPUTE_WH"] * app_count,
+        "URL_ID": [f"{i:032x}" for i in range(app_count)],
+        "OWNER_ROLE_TYPE": ["ROLE"] * app_count,
+        "ROOT_LOCATION": [f"@DB_{i % 40}.SCHEMA_{i % 300}.STAGE_{i}" for i in range(app_count)],
+        "MAIN_FILE": ["streamlit_app.py"] * app_count,
+        "LAST_ALTERED": [now - timedelta(seconds=i) for i in range(app_count)],
+        "IMPORT_URLS": ["[]"] * app_count
+    })
+
+def legacy_map_row_to_standard_format(row_dict):
+    """The original per-row mapping from get_user_streamlit_apps"""
+    return {
+        'APP_NAME': (row_dict.get('TITLE') or row_dict.get('title') or
+                   row_dict.get('STREAMLIT_TITLE') or row_dict.get('streamlit_title') or
+                   row_dict.get('APP_TITLE') or row_dict.get('app_title') or
+                   row_dict.get('NAME') or row_dict.get('name') or
+                   row_dict.get('APP_NAME') or row_dict.get('app_name') or
+                   row_dict.get('STREAMLIT_NAME') or row_dict.get('streamlit_name') or 'Unknown'),
+        'INTERNAL_NAME': (row_dict.get('STREAMLIT_NAME') or row_dict.get('streamlit_name') or
+                        row_dict.get('NAME') or row_dict.get('name') or
+                        row_dict.get('APP_NAME') or row_dict.get('app_name') or 'Unknown'),
+        'APP_URL': (row_dict.get('STREAMLIT_URL_ID') or row_dict.get('streamlit_url_id') or
+                  row_dict.get('STREAMLIT_URL') or row_dict.get('streamlit_url') or
+                  row_dict.get('URL_ID') or row_dict.get('url_id') or
+                  row_dict.get('APP_URL_ID') or row_dict.get('app_url_id') or
+                  row_dict.get('URL') or row_dict.get('url') or
+                  row_dict.get('APP_URL') or row_dict.get('app_url') or ''),
+        'CREATED_ON': (row_dict.get('CREATED_ON') or row_dict.get('created_on') or
+                     row_dict.get('CREATED') or ''),
+        'OWNER': (row_dict.get('STREAMLIT_OWNER') or row_dict.get('streamlit_owner') or
+                row_dict.get('OWNER') or row_dict.get('owner') or
+                row_dict.get('CREATED_BY') or row_dict.get('created_by') or 'Unknown'),
+        'DESCRIPTION': (row_dict.get('COMMENT') or row_dict.get('comment') or
+                      row_dict.get('DESCRIPTION') or 'No description available'),
+        'DATABASE_NAME': (row_dict.get('STREAMLIT_CATALOG') or row_dict.get('streamlit_catalog') or
+                        row_dict.get('DATABASE_NAME') or row_dict.get('database_name') or
+                        row_dict.get('DB') or ''),
+        'SCHEMA_NAME': (row_dict.get('STREAMLIT_SCHEMA') or row_dict.get('streamlit_schema') or
+                      row_dict.get('SCHEMA_NAME') or row_dict.get('schema_name') or
+                      row_dict.get('SCHEMA') or ''),
+        'ACCESS_STATUS': 'Available',
+        'ACCESS_LEVEL': 'USAGE'
+    }
+
+def to_ipc_bytes(table):
+    """Serialize a table the way result batches arrive over the wire"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def legacy_path(full_payload):
+    """SELECT * -> Row objects -> asDict() per row -> per-row mapping -> DataFrame"""
+    table = pa.ipc.open_stream(full_payload).read_all()
+    rows = [Row(**values) for values in table.to_pylist()]
+    apps_data = [legacy_map_row_to_standard_format(row.asDict()) for row in rows]
+    return pd.DataFrame(apps_data)
+
+def projected_path(projected_payload, query):
+    """Projected columns -> Arrow batches -> pandas -> one vectorized normalization"""
+    raw_df = pa.ipc.open_stream(projected_payload).read_all().to_pandas()
+    mapping = landing_page.get_catalog_mapping({}, query, list(raw_df.columns))
+    return landing_page.normalize_catalog_frame(raw_df, mapping)
+
+def run_once(func, args, results):
+    """Run func in this (forked) process and report wall time and peak RSS growth"""
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, (peak_kb - baseline_kb) * 1024))
+
+def measure(func, *args, repeat):
+    """
+    Return (median seconds, peak bytes) over repeat runs. Each run happens in a fresh
+    forked process so peak RSS covers Python, NumPy and Arrow allocations alike.
+    """
+    context = multiprocessing.get_context("fork")
+    timings = []
+    peaks = []
+    for _ in range(repeat):
+        results = context.Queue()
+        process = context.Process(target=run_once, args=(func, args, results))
+        process.start()
+        elapsed, peak = results.get()
+        process.join()
+        timings.append(elapsed)
+        peaks.append(peak)
+    return statistics.median(timings), max(peaks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the legacy and projected catalog load paths")
+    parser.add_argument("--apps", type=int, default=50000, help="Number of synthetic apps")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path")
+    args = parser.parse_args()
+    
+    table = build_synthetic_catalog(args.apps)
+    full_payload = to_ipc_bytes(table)
+    
+    # Project the same columns the landing page would request
+    query = "SELECT * FROM SNOWFLAKE.INFORMATION_SCHEMA.STREAMLITS"
+    mapping = landing_page.resolve_catalog_schema(SYNTHETIC_COLUMNS)
+    projected_columns = list(dict.fromkeys(column for sources in mapping.values() for column in sources))
+    projected_payload = to_ipc_bytes(table.select(projected_columns))
+    projected_query = landing_page.build_projected_query(query, mapping)
+    
+    legacy_seconds, legacy_peak = measure(legacy_path, full_payload, repeat=args.repeat)
+    projected_seconds, projected_peak = measure(projected_path, projected_payload, projected_query, repeat=args.repeat)
+    
+    print(f"Synthetic catalog: {args.apps:,} apps, {len(SYNTHETIC_COLUMNS)} columns ({len(projected_columns)} projected)")
+    print(f"Transfer size: {full_payload.size / 1e6:.1f} MB -> {projected_payload.size / 1e6:.1f} MB")
+    print(f"{'path':<12}{'median ms':>12}{'peak RSS MB':>14}")
+    print(f"{'legacy':<12}{legacy_seconds * 1000:>12.1f}{legacy_peak / 1e6:>14.1f}")
+    print(f"{'projected':<12}{projected_seconds * 1000:>12.1f}{projected_peak / 1e6:>14.1f}")
+    print(f"Speedup: {legacy_seconds / projected_seconds:.1f}x | Peak memory: {projected_peak / legacy_peak:.0%} of legacy")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Chart Downsampling Benchmark
+# Measures the Chart Maker downsampling stage on generated time series of growing size:
+#   - min/max: min/max bucketing alone (two points per bucket)
+#   - lttb: Largest-Triangle-Three-Buckets over the full series
+#   - min/max + lttb: the app's path (min/max candidates, then LTTB, peaks kept)
+# and checks that idxmax / idxmin of every downsampled series match the full series.
+#
+# Usage:
+#   python benchmarks/bench_chart_downsampling.py [--sizes 10000 1000000 5000000] [--budget 700]
+#                                                 [--repeat 5]
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+import simple_chart_maker as chart_maker
+
+def timed(func, repeat):
+    """Median wall time of func in milliseconds, and its last result"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return 1000 * statistics.median(timings), result
+
+def benchmark_size(size, budget, repeat):
+    data = chart_maker.generate_chart_data.__wrapped__("Line Chart", 0, size)
+    values = data['Sales'].to_numpy().astype(float)
+    methods = {
+        "min/max": lambda: chart_maker.minmax_indices(values, budget // 2),
+        "lttb": lambda: chart_maker.lttb_indices(np.arange(size, dtype=float), values, budget),
+        "min/max + lttb": lambda: chart_maker.downsample_indices(values, budget)
+    }
+    results = {}
+    for name, method in methods.items():
+        elapsed, indices = timed(method, repeat)
+        sampled = data['Sales'].iloc[indices]
+        peaks_kept = sampled.idxmax() == data['Sales'].idxmax() and sampled.idxmin() == data['Sales'].idxmin()
+        results[name] = (elapsed, len(indices), peaks_kept)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Chart Maker downsampling")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 1_000_000, 5_000_000])
+    parser.add_argument("--budget", type=int, default=chart_maker.DEFAULT_CHART_WIDTH * chart_maker.POINTS_PER_PIXEL)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (median is reported)")
+    args = parser.parse_args()
+
+    print(f"Budget: {args.budget} points")
+    print(f"{'size':>12}{'method':>18}{'ms':>10}{'points':>8}  peaks kept")
+    for size in args.sizes:
+        for name, (elapsed, points, peaks_kept) in benchmark_size(size, args.budget, args.repeat).items():
+            print(f"{size:>12,}{name:>18}{elapsed:>10.1f}{points:>8}  {'yes' if peaks_kept else 'no'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Data Explorer Benchmark
+# Measures the Data Explorer metric path on generated sample data of growing size:
+#   - metrics (scan): boolean-mask filtering then sum / sum / mean over the filtered frame
+#   - metrics (cube): one lookup in the precomputed Region x Product aggregate cube
+#   - cube build: building the cube from the full frame
+#   - cube append: adding a batch of new rows to an existing cube
+# Metric latencies are the median over every Region/Product filter combination.
+#
+# Usage:
+#   python benchmarks/bench_data_explorer.py [--sizes 10000 1000000 10000000] [--repeat 5]
+#                                            [--append-rows 10000]
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import simple_data_explorer as explorer
+
+def timed(func, repeat):
+    """Median wall time of func in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return 1000 * statistics.median(timings)
+
+def scan_metrics(df, selected_region, selected_product):
+    """The original metric path: mask filters, then sum / sum / mean over the copy"""
+    filtered_df = df
+    if selected_region != 'All':
+        filtered_df = filtered_df[filtered_df['Region'] == selected_region]
+    if selected_product != 'All':
+        filtered_df = filtered_df[filtered_df['Product'] == selected_product]
+    return len(filtered_df), filtered_df['Sales'].sum(), filtered_df['Quantity'].sum(), filtered_df['Sales'].mean()
+
+def benchmark_size(size, repeat, append_rows):
+    df = explorer.generate_sample_data.__wrapped__(explorer.DEFAULT_SEED, size)
+    combinations = [
+        (selected_region, selected_product)
+        for selected_region in ['All'] + explorer.REGIONS
+        for selected_product in ['All'] + explorer.PRODUCTS
+    ]
+
+    cube = explorer.AggregateCube.from_frame(df)
+    for selected_region, selected_product in combinations:
+        row_count, total_sales, total_quantity = cube.lookup(selected_region, selected_product)
+        expected = scan_metrics(df, selected_region, selected_product)
+        assert (row_count, total_sales, total_quantity) == tuple(int(value) for value in expected[:3])
+
+    batch = explorer.generate_sample_data.__wrapped__(explorer.DEFAULT_SEED + 1, append_rows)
+    return {
+        "metrics (scan)": statistics.median(
+            timed(lambda combination=combination: scan_metrics(df, *combination), repeat) for combination in combinations
+        ),
+        "metrics (cube)": statistics.median(
+            timed(lambda combination=combination: cube.lookup(*combination), repeat) for combination in combinations
+        ),
+        "cube build": timed(lambda: explorer.AggregateCube.from_frame(df), repeat),
+        f"cube append {append_rows:,} rows": timed(lambda: cube.append(batch), repeat)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Data Explorer metrics against the aggregate cube")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (median is reported)")
+    parser.add_argument("--append-rows", type=int, default=10_000, help="Rows per appended batch")
+    args = parser.parse_args()
+
+    results = {size: benchmark_size(size, args.repeat, args.append_rows) for size in args.sizes}
+    cases = list(next(iter(results.values())))
+
+    print(f"{'case':<28}" + "".join(f"{f'{size:,} rows':>16}" for size in args.sizes))
+    for case in cases:
+        print(f"{case:<28}" + "".join(f"{results[size][case]:>13.3f} ms" for size in args.sizes))
+
+if __name__ == "__main__":
+    main()
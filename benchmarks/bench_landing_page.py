@@ -0,0 +1,153 @@
+# Landing Page Benchmark Suite
+# Measures the landing page hot paths against the offline LocalSession stand-in, seeded
+# with synthetic STREAMLITS catalogs of 10, 1k and 50k apps:
+#   - get_user_streamlit_apps: cold start (strategy probing) and steady state (remembered strategy)
+#   - normalize_catalog_frame: mapping raw catalog rows to the standard format
+#   - main(): first page load and warm reruns through Streamlit's app-testing harness
+# Reports latency percentiles and peak traced memory. Results can be saved as JSON and
+# compared against a previous run to catch regressions.
+#
+# Usage:
+#   python benchmarks/bench_landing_page.py [--sizes small medium large] [--iterations 10]
+#                                           [--json results.json] [--baseline previous.json]
+
+import argparse
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, ".."))
+
+import local_session
+import streamlit_landing_page as landing_page
+
+OFFLINE_APP = os.path.join(BENCHMARK_DIR, "offline_landing_page.py")
+
+# Catalog snapshots persisted during the run go here instead of the shared snapshot directory
+SNAPSHOT_ROOT = tempfile.mkdtemp(prefix="landing_page_bench_")
+atexit.register(shutil.rmtree, SNAPSHOT_ROOT, True)
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def run_case(func, iterations, setup=None):
+    """Time func over iterations (calling setup before each, untimed) and trace peak memory"""
+    timings = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "p50_ms": 1000 * percentile(timings, 0.50),
+        "p90_ms": 1000 * percentile(timings, 0.90),
+        "p99_ms": 1000 * percentile(timings, 0.99),
+        "max_ms": 1000 * max(timings),
+        "peak_mb": peak / 1e6
+    }
+
+def reset_landing_page_state():
+    """Forget remembered strategies, resolved schemas, cached catalogs and persisted snapshots"""
+    st.cache_resource.clear()
+    # A new directory rather than emptying the old one, so a snapshot still being written
+    # in the background by the previous case cannot leak into the next
+    landing_page.CATALOG_SNAPSHOT_DIR = tempfile.mkdtemp(dir=SNAPSHOT_ROOT)
+
+def run_app():
+    """One script run of the landing page through the app-testing harness"""
+    app = AppTest.from_file(OFFLINE_APP, default_timeout=120)
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return app
+
+def benchmark_size(size_name, app_count, iterations):
+    """Run every benchmark case for one catalog size"""
+    session = local_session.LocalSession.with_catalog(app_count, user="BENCH_USER", role="BENCH_ROLE")
+    raw_df = session.sql("SELECT * FROM INFORMATION_SCHEMA.STREAMLITS").to_pandas()
+    query = "SELECT * FROM INFORMATION_SCHEMA.STREAMLITS"
+    mapping = landing_page.resolve_catalog_schema(list(raw_df.columns))
+    os.environ["LANDING_PAGE_BENCH_APPS"] = str(app_count)
+    
+    results = {}
+    results["get_user_streamlit_apps (cold)"] = run_case(
+        lambda: landing_page.get_user_streamlit_apps(session, role="BENCH_ROLE"),
+        iterations,
+        setup=reset_landing_page_state
+    )
+    reset_landing_page_state()
+    results["get_user_streamlit_apps (warm)"] = run_case(
+        lambda: landing_page.get_user_streamlit_apps(session, role="BENCH_ROLE"),
+        iterations
+    )
+    results["normalize_catalog_frame"] = run_case(
+        lambda: landing_page.normalize_catalog_frame(raw_df, landing_page.get_catalog_mapping({}, query, list(raw_df.columns))),
+        iterations
+    )
+    results["main() first load"] = run_case(run_app, iterations, setup=reset_landing_page_state)
+    
+    # Warm reruns share the process-wide caches filled by the first load
+    reset_landing_page_state()
+    run_app()
+    results["main() rerun"] = run_case(run_app, iterations)
+    
+    session.close()
+    return {f"{size_name}/{case}": stats for case, stats in results.items()}
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Return the cases whose p50 latency regressed by more than tolerance"""
+    regressions = []
+    for case, stats in results.items():
+        previous = baseline.get(case)
+        if previous and stats["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append((case, previous["p50_ms"], stats["p50_ms"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the landing page against an offline session")
+    parser.add_argument("--sizes", nargs="+", choices=list(local_session.CATALOG_SIZES), default=list(local_session.CATALOG_SIZES))
+    parser.add_argument("--iterations", type=int, default=10, help="Timed runs per case")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare p50 latencies against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p50 slowdown before a case counts as a regression")
+    args = parser.parse_args()
+    
+    results = {}
+    for size_name in args.sizes:
+        results.update(benchmark_size(size_name, local_session.CATALOG_SIZES[size_name], args.iterations))
+    
+    print(f"{'case':<48}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'peak MB':>10}")
+    for case, stats in results.items():
+        print(f"{case:<48}{stats['p50_ms']:>10.1f}{stats['p90_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}{stats['peak_mb']:>10.1f}")
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        for case, before, after in regressions:
+            print(f"REGRESSION {case}: p50 {before:.1f} ms -> {after:.1f} ms")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
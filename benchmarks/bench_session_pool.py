@@ -0,0 +1,78 @@
+# Session Pool Benchmark
+# Simulates concurrent page loads (user context query + catalog query) against the
+# app_runtime.SessionPool, backed by LocalSession stand-ins with an artificial login and
+# query latency, and reports throughput, pool utilization and lease wait times per pool size.
+#
+# Usage:
+#   python benchmarks/bench_session_pool.py [--users 16] [--loads 20] [--pool-sizes 1 2 4 8]
+#                                           [--login-ms 500] [--query-ms 20]
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import app_runtime
+import local_session
+
+class SlowSession(local_session.LocalSession):
+    """LocalSession with a fixed round-trip latency per query, standing in for a warehouse"""
+
+    query_seconds = 0.0
+
+    def _execute(self, query, params=None, fetch=True):
+        time.sleep(self.query_seconds)
+        return super()._execute(query, params, fetch)
+
+def run_pool(pool_size, users, loads, login_seconds, query_seconds):
+    """Run users threads doing loads page loads each; returns (elapsed seconds, pool stats)"""
+    def factory():
+        time.sleep(login_seconds)
+        session = SlowSession.with_catalog(100)
+        session.query_seconds = query_seconds
+        return session
+
+    pool = app_runtime.SessionPool(factory, pool_size, min_size=pool_size, acquire_timeout=300)
+    pool.warm_up()
+    session = app_runtime.PooledSession(pool)
+
+    def page_loads():
+        for _ in range(loads):
+            session.sql("SELECT CURRENT_USER() AS username, CURRENT_ROLE() AS current_role").collect()
+            session.sql("SELECT * FROM INFORMATION_SCHEMA.STREAMLITS").to_pandas()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=page_loads) for _ in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = pool.stats()
+    pool.close()
+    return elapsed, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the session pool under concurrent page loads")
+    parser.add_argument("--users", type=int, default=16, help="Concurrent users")
+    parser.add_argument("--loads", type=int, default=20, help="Page loads per user")
+    parser.add_argument("--pool-sizes", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--login-ms", type=float, default=500, help="Simulated login time per session")
+    parser.add_argument("--query-ms", type=float, default=20, help="Simulated round trip per query")
+    args = parser.parse_args()
+
+    print(f"{args.users} users x {args.loads} page loads, {args.query_ms:.0f} ms per query")
+    print(f"{'pool':>6}{'loads/s':>10}{'avg util':>10}{'waited':>10}{'wait p50':>10}{'wait p95':>10}{'wait max':>10}")
+    for pool_size in args.pool_sizes:
+        elapsed, stats = run_pool(pool_size, args.users, args.loads, args.login_ms / 1000, args.query_ms / 1000)
+        print(
+            f"{pool_size:>6}{args.users * args.loads / elapsed:>10.1f}{stats['average_utilization']:>10.0%}"
+            f"{stats['waited']:>10}{stats['wait_p50_ms']:>10.1f}{stats['wait_p95_ms']:>10.1f}{stats['wait_max_ms']:>10.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# App Startup Benchmark
+# Compares the cold start of every app before and after the shared app_runtime module
+# (lazy Snowpark session, deferred heavy imports). Each run starts a fresh interpreter,
+# imports Streamlit and performs the app's first script run through Streamlit's
+# app-testing harness. The "before" sources are read from git (by default the commit
+# before app_runtime.py was added), the "after" sources from the working tree.
+# The landing page runs against the offline LocalSession stand-in.
+#
+# Usage:
+#   python benchmarks/bench_startup.py [--apps simple_calculator ...] [--runs 5]
+#                                      [--before-ref <git ref>] [--json results.json]
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+APPS = [
+    "streamlit_landing_page",
+    "simple_data_explorer",
+    "simple_chart_maker",
+    "simple_text_analyzer",
+    "simple_calculator",
+    "simple_survey_form"
+]
+
+# Files every variant directory needs besides the apps themselves
+SUPPORT_FILES = ["app_runtime.py", "local_session.py"]
+
+# Modules whose import dominates cold start; reported when an app's first run loaded them
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "snowflake.snowpark"]
+
+# Runs the landing page against a LocalSession, like benchmarks/offline_landing_page.py
+OFFLINE_LANDING_PAGE = """
+import local_session
+import streamlit_landing_page as landing_page
+
+landing_page.init_connection = lambda: local_session.shared_session(1000, user="BENCH_USER", role="BENCH_ROLE")
+landing_page.main()
+"""
+
+# Executed in a fresh interpreter: argv[1] is the variant directory, argv[2] the script to run
+RUNNER = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file(sys.argv[2], default_timeout=120)
+app.run()
+finished = time.perf_counter()
+print(json.dumps({
+    "import_streamlit_ms": 1000 * (imported - started),
+    "first_run_ms": 1000 * (finished - imported),
+    "modules": [name for name in sys.argv[3:] if name in sys.modules],
+    "error": str(app.exception[0].value) if app.exception else None
+}))
+"""
+
+def default_before_ref():
+    """Parent of the commit that added app_runtime.py, or HEAD if it is not committed yet"""
+    added = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "-1", "--", "app_runtime.py"],
+        cwd=REPO_DIR, capture_output=True, text=True
+    ).stdout.strip()
+    return f"{added}^" if added else "HEAD"
+
+def write_variant(directory, before_ref=None):
+    """Populate directory with the apps from before_ref (or the working tree when None)"""
+    os.makedirs(directory)
+    for name in [f"{app}.py" for app in APPS] + SUPPORT_FILES:
+        target = os.path.join(directory, name)
+        if before_ref is None:
+            if os.path.exists(os.path.join(REPO_DIR, name)):
+                shutil.copy(os.path.join(REPO_DIR, name), target)
+            continue
+        shown = subprocess.run(["git", "show", f"{before_ref}:{name}"], cwd=REPO_DIR, capture_output=True)
+        if shown.returncode == 0:
+            with open(target, "wb") as f:
+                f.write(shown.stdout)
+    with open(os.path.join(directory, "offline_streamlit_landing_page.py"), "w") as f:
+        f.write(OFFLINE_LANDING_PAGE)
+
+def measure(directory, app, runs):
+    """Cold-start one app runs times, each in a fresh interpreter with an empty temp dir"""
+    script = "offline_streamlit_landing_page.py" if app == "streamlit_landing_page" else f"{app}.py"
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as scratch:
+            env = dict(os.environ, TMPDIR=scratch)
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-c", RUNNER, directory, os.path.join(directory, script)] + HEAVY_MODULES,
+                capture_output=True, text=True, env=env
+            )
+            wall_ms = 1000 * (time.perf_counter() - start)
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            error = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+            return {"error": error}
+        result = json.loads(lines[-1])
+        if result["error"]:
+            return {"error": result["error"]}
+        result["wall_ms"] = wall_ms
+        samples.append(result)
+    return {
+        "wall_ms": statistics.median(sample["wall_ms"] for sample in samples),
+        "import_streamlit_ms": statistics.median(sample["import_streamlit_ms"] for sample in samples),
+        "first_run_ms": statistics.median(sample["first_run_ms"] for sample in samples),
+        "modules": samples[-1]["modules"]
+    }
+
+def format_result(result):
+    if "error" in result:
+        return f"{'n/a':>10}{'':>10}  {result['error'][:60]}"
+    return f"{result['wall_ms']:>10.0f}{result['first_run_ms']:>10.0f}  {', '.join(result['modules']) or '-'}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare app cold starts before and after the shared app runtime")
+    parser.add_argument("--apps", nargs="+", choices=APPS, default=APPS)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per app and variant (median is reported)")
+    parser.add_argument("--before-ref", help="Git ref of the 'before' sources (default: commit before app_runtime.py)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    before_ref = args.before_ref or default_before_ref()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        variants = {"before": os.path.join(workdir, "before"), "after": os.path.join(workdir, "after")}
+        write_variant(variants["before"], before_ref)
+        write_variant(variants["after"])
+
+        for app in args.apps:
+            results[app] = {name: measure(directory, app, args.runs) for name, directory in variants.items()}
+
+    print(f"Before: {before_ref} | After: working tree | median of {args.runs} cold starts")
+    print(f"{'app':<26}{'variant':<8}{'wall ms':>10}{'run ms':>10}  heavy modules loaded")
+    for app, variants in results.items():
+        for name, result in variants.items():
+            print(f"{app:<26}{name:<8}{format_result(result)}")
+        before, after = variants["before"], variants["after"]
+        if "error" not in before and "error" not in after:
+            print(f"{'':<26}{'change':<8}{after['wall_ms'] - before['wall_ms']:>+10.0f}{after['first_run_ms'] - before['first_run_ms']:>+10.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"before_ref": before_ref, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
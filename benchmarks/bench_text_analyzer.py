@@ -0,0 +1,136 @@
+# Text Analyzer Benchmark
+# Compares the original analyze_text (replace, split() three ways, the \b\w+\b regex,
+# set(words), Counter(words) and a separate length sum, each a full pass over the text)
+# with the current one (in-place counts, one tokenizing pass, everything else from the
+# word Counter) on generated documents of growing size, ASCII and non-ASCII, and checks
+# that both return the same dict. A second table times a one-word edit in the middle of
+# each document: a full analyze_text vs IncrementalTextAnalysis.update, which re-analyzes
+# only the edited paragraph.
+#
+# Usage:
+#   python benchmarks/bench_text_analyzer.py [--sizes 10000 1000000 5000000] [--repeat 5]
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import simple_text_analyzer as text_analyzer
+
+def legacy_analyze_text(text):
+    """The original analyze_text"""
+    if not text.strip():
+        return None
+
+    # Basic stats
+    char_count = len(text)
+    char_count_no_spaces = len(text.replace(' ', ''))
+    word_count = len(text.split())
+    line_count = len(text.split('\n'))
+    paragraph_count = len([p for p in text.split('\n\n') if p.strip()])
+
+    # Word analysis
+    words = re.findall(r'\b\w+\b', text.lower())
+    unique_words = len(set(words))
+    most_common_words = Counter(words).most_common(5)
+
+    # Average calculations
+    avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+    avg_words_per_line = word_count / line_count if line_count > 0 else 0
+
+    return {
+        'char_count': char_count,
+        'char_count_no_spaces': char_count_no_spaces,
+        'word_count': word_count,
+        'line_count': line_count,
+        'paragraph_count': paragraph_count,
+        'unique_words': unique_words,
+        'most_common_words': most_common_words,
+        'avg_word_length': avg_word_length,
+        'avg_words_per_line': avg_words_per_line
+    }
+
+def generate_document(size, alphabet, seed=0):
+    """About size characters of sentences from a 20,000 word vocabulary, in paragraphs of a few lines"""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choices(alphabet, k=rng.randint(1, 10))) for _ in range(20_000)]
+    paragraphs = []
+    length = 0
+    while length < size:
+        lines = []
+        for _ in range(rng.randint(1, 6)):
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(3, 15))]
+            words[0] = words[0].capitalize()
+            lines.append(' '.join(words) + rng.choice('.!?,;'))
+        paragraphs.append('\n'.join(lines))
+        length += len(paragraphs[-1]) + 2
+    return '\n\n'.join(paragraphs)[:size]
+
+def timed(func, repeat):
+    """Median wall time of func in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return 1000 * statistics.median(timings)
+
+def edit_word(text, position):
+    """text with the word at or after position replaced by a new word"""
+    start = text.index(' ', position) + 1
+    end = text.index(' ', start)
+    return text[:start] + f"edited{position}" + text[end:]
+
+def benchmark_edits(text, repeat):
+    """Median ms of a full analysis and of an incremental update after a one-word edit"""
+    analysis = text_analyzer.IncrementalTextAnalysis(text_analyzer.ParagraphCache(text_analyzer.PARAGRAPH_CACHE_ENTRIES))
+    analysis.update(text)
+    full, incremental = [], []
+    for attempt in range(repeat):
+        # A different edit each time, so the edited paragraph is never already cached
+        text = edit_word(text, len(text) // 2 + 97 * attempt)
+        full.append(timed(lambda: text_analyzer.analyze_text(text), 1))
+        start = time.perf_counter()
+        result = analysis.update(text)
+        incremental.append(1000 * (time.perf_counter() - start))
+        if result != text_analyzer.analyze_text(text):
+            raise AssertionError("incremental analysis differs from analyze_text")
+    return statistics.median(full), statistics.median(incremental), analysis.reanalyzed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analyze_text against the original implementation")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (median is reported)")
+    args = parser.parse_args()
+
+    alphabets = {
+        "ascii": "abcdefghijklmnopqrstuvwxyz",
+        "non-ascii": "abcdefghijklmnopqrstuvwxyzéèüößçñ"
+    }
+    print(f"{'document':<12}{'chars':>12}{'original ms':>14}{'current ms':>12}{'speedup':>9}  same result")
+    for name, alphabet in alphabets.items():
+        for size in args.sizes:
+            text = generate_document(size, alphabet)
+            same = legacy_analyze_text(text) == text_analyzer.analyze_text(text)
+            legacy_ms = timed(lambda: legacy_analyze_text(text), args.repeat)
+            current_ms = timed(lambda: text_analyzer.analyze_text(text), args.repeat)
+            print(
+                f"{name:<12}{size:>12,}{legacy_ms:>14.1f}{current_ms:>12.1f}{legacy_ms / current_ms:>8.1f}x"
+                f"  {'yes' if same else 'NO'}"
+            )
+
+    print()
+    print(f"{'document':<12}{'chars':>12}{'full ms':>14}{'edit ms':>12}{'speedup':>9}  paragraphs re-analyzed")
+    for name, alphabet in alphabets.items():
+        for size in args.sizes:
+            full_ms, edit_ms, reanalyzed = benchmark_edits(generate_document(size, alphabet), args.repeat)
+            print(f"{name:<12}{size:>12,}{full_ms:>14.1f}{edit_ms:>12.2f}{full_ms / edit_ms:>8.0f}x  {reanalyzed}")
+
+if __name__ == "__main__":
+    main()
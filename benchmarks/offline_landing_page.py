@@ -0,0 +1,21 @@
+# Offline Landing Page
+# Runs streamlit_landing_page.main() against a LocalSession seeded with a synthetic catalog.
+# Used by bench_landing_page.py through Streamlit's app-testing harness, and can also be
+# started directly for local profiling:
+#
+#   LANDING_PAGE_BENCH_APPS=50000 streamlit run benchmarks/offline_landing_page.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import local_session
+import streamlit_landing_page as landing_page
+
+# There is no stage offline, so catalog snapshots stay in the local snapshot directory
+landing_page.CATALOG_SNAPSHOT_STAGE = None
+landing_page.init_connection = lambda: local_session.shared_session(
+    int(os.environ.get("LANDING_PAGE_BENCH_APPS", "1000")), user="BENCH_USER", role="BENCH_ROLE"
+)
+landing_page.main()
@@ -22,6 +22,7 @@ LIST @app_stage;
 -- Replace '/path/to/your/' with your actual file path
 
 /*
+PUT file:///path/to/your/app_runtime.py @app_stage overwrite=true;
 PUT file:///path/to/your/simple_data_explorer.py @app_stage overwrite=true;
 PUT file:///path/to/your/simple_calculator.py @app_stage overwrite=true;
 PUT file:///path/to/your/simple_chart_maker.py @app_stage overwrite=true;
@@ -22,6 +22,11 @@ USE SCHEMA STREAMLIT_APPS.LANDING_PAGE;
 CREATE STAGE IF NOT EXISTS app_stage
 COMMENT = 'Stage for Streamlit Landing Page application files';
 
+-- The landing page also keeps its catalog snapshots on this stage, under catalog_snapshots/
+-- (CATALOG_SNAPSHOT_STAGE in streamlit_landing_page.py), so a restarted app can show the
+-- last catalog immediately. The role that owns the app needs READ and WRITE on the stage,
+-- which it already has when it also owns the stage.
+
 -- =============================================================================
 -- STEP 3: Upload Files to Stage
 -- =============================================================================
@@ -29,6 +34,7 @@ COMMENT = 'Stage for Streamlit Landing Page application files';
 -- Upload the main application file
 -- Note: You need to run these PUT commands from SnowSQL or a tool that supports file upload
 -- PUT file:///path/to/your/streamlit_landing_page.py @app_stage overwrite=true;
+-- PUT file:///path/to/your/app_runtime.py @app_stage overwrite=true;
 -- PUT file:///path/to/your/requirements.txt @app_stage overwrite=true;
 
 -- You can also use Snowsight UI to upload files to the stage
@@ -63,6 +69,19 @@ GRANT USAGE ON DATABASE SNOWFLAKE TO ROLE ACCOUNTADMIN;
 -- GRANT READ SESSION ON ACCOUNT TO ROLE <your_streamlit_owner_role>;
 -- GRANT USAGE ON DATABASE SNOWFLAKE TO ROLE <your_streamlit_owner_role>;
 
+-- Usage events table - app launches are written here in batches and used to rank
+-- apps by popularity. The app creates it on first use if the owner role can create tables;
+-- otherwise create it up front:
+CREATE TABLE IF NOT EXISTS STREAMLIT_APPS.LANDING_PAGE.LANDING_PAGE_EVENTS (
+    EVENT_TIME TIMESTAMP_NTZ,
+    EVENT_TYPE VARCHAR,
+    USERNAME VARCHAR,
+    ROLE_NAME VARCHAR,
+    DATABASE_NAME VARCHAR,
+    SCHEMA_NAME VARCHAR,
+    APP_NAME VARCHAR
+);
+
 -- =============================================================================
 -- STEP 6: Grant Access to Users/Roles  
 -- =============================================================================
@@ -171,6 +190,9 @@ LIMIT 100;
 -- To check stage contents:
 -- LIST @app_stage;
 
+-- To discard the persisted catalog snapshots:
+-- REMOVE @app_stage/catalog_snapshots/;
+
 -- To remove files from stage:
 -- REMOVE @app_stage/streamlit_landing_page.py;
 
@@ -184,7 +206,7 @@ LIMIT 100;
 /*
 □ 1. Database and schema created
 □ 2. Stage created for application files  
-□ 3. Files uploaded to stage (streamlit_landing_page.py, requirements.txt)
+□ 3. Files uploaded to stage (streamlit_landing_page.py, app_runtime.py, requirements.txt)
 □ 4. Warehouse specified and accessible
 □ 5. READ SESSION privilege granted to Streamlit app owner role (CRITICAL!)
 □ 6. Streamlit application created successfully
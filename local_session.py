@@ -0,0 +1,234 @@
+# Local Session - Offline Stand-in for a Snowpark Session
+# Implements the small part of the Snowpark surface the apps use
+# (session.sql(...).collect() / to_pandas() / collect_nowait(), Row.asDict(), df.schema.names)
+# on top of an embedded SQLite database, so the landing page can be profiled without an account.
+# SNOWFLAKE.ACCOUNT_USAGE.GRANTS_TO_ROLES is emulated as well, so entitlement filtering is exercised.
+
+import functools
+import random
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Synthetic catalog sizes used by the benchmark suite
+CATALOG_SIZES = {
+    "small": 10,
+    "medium": 1000,
+    "large": 50000
+}
+
+# Columns of the emulated INFORMATION_SCHEMA.STREAMLITS view
+STREAMLITS_COLUMNS = [
+    "CREATED_ON", "NAME", "DATABASE_NAME", "SCHEMA_NAME", "TITLE", "OWNER", "COMMENT",
+    "QUERY_WAREHOUSE", "URL_ID", "OWNER_ROLE_TYPE", "ROOT_LOCATION", "MAIN_FILE"
+]
+
+# Columns of the emulated ACCOUNT_USAGE.GRANTS_TO_ROLES view
+GRANTS_TO_ROLES_COLUMNS = [
+    "PRIVILEGE", "GRANTED_ON", "NAME", "TABLE_CATALOG", "TABLE_SCHEMA", "GRANTEE_NAME", "DELETED_ON"
+]
+
+# Share of synthetic apps the session role can use, and of those, the share it owns
+USABLE_APP_SHARE = 0.8
+OWNED_APP_SHARE = 0.1
+
+# SHOW STREAMLITS returns a subset of the view columns with lower-case names
+SHOW_STREAMLITS_QUERY = (
+    "SELECT created_on, name, database_name, schema_name, title, owner, comment, "
+    "query_warehouse, url_id, owner_role_type FROM INFORMATION_SCHEMA.STREAMLITS"
+)
+
+class Row(tuple):
+    """Tuple with named fields, mirroring snowflake.snowpark.Row"""
+
+    def __new__(cls, fields, values):
+        row = tuple.__new__(cls, values)
+        row._fields = fields
+        return row
+
+    def asDict(self):
+        return dict(zip(self._fields, self))
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            return tuple.__getitem__(self, self._fields.index(item))
+        return tuple.__getitem__(self, item)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except ValueError:
+            raise AttributeError(name) from None
+
+class LocalAsyncJob:
+    """Mirrors snowflake.snowpark.AsyncJob for queries submitted with collect_nowait()"""
+
+    def __init__(self, future):
+        self._future = future
+
+    def is_done(self):
+        return self._future.done()
+
+    def result(self):
+        return self._future.result()
+
+class LocalDataFrame:
+    """Lazily executed query result, mirroring the parts of snowflake.snowpark.DataFrame the apps use"""
+
+    def __init__(self, session, query, params=None):
+        self._session = session
+        self._query = query
+        self._params = params
+
+    @property
+    def schema(self):
+        """Column names of the result, without fetching any rows"""
+        fields, _ = self._session._execute(self._query, self._params, fetch=False)
+        return SimpleNamespace(names=fields)
+
+    def collect(self):
+        fields, rows = self._session._execute(self._query, self._params)
+        return [Row(fields, values) for values in rows]
+
+    def collect_nowait(self):
+        return LocalAsyncJob(self._session._executor.submit(self.collect))
+
+    def to_pandas(self):
+        import pandas as pd
+
+        fields, rows = self._session._execute(self._query, self._params)
+        return pd.DataFrame.from_records(rows, columns=fields)
+
+class LocalSession:
+    """
+    SQLite-backed stand-in for snowflake.snowpark.Session. Snowflake-specific
+    statements the apps issue (SHOW STREAMLITS, SNOWFLAKE.INFORMATION_SCHEMA,
+    CURRENT_USER(), CURRENT_ROLE(), CURRENT_ACCOUNT()) are translated to SQLite equivalents.
+    """
+
+    def __init__(self, user="LOCAL_USER", role="LOCAL_ROLE", account="LOCAL_ACCOUNT"):
+        self.user = user
+        self.role = role
+        self.account = account
+        self.closed = False
+        self.query_count = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="local-session")
+        self._connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self._connection.execute("ATTACH DATABASE ':memory:' AS INFORMATION_SCHEMA")
+        self._connection.execute("ATTACH DATABASE ':memory:' AS ACCOUNT_USAGE")
+        self._connection.create_function("CURRENT_USER", 0, lambda: self.user)
+        self._connection.create_function("CURRENT_ROLE", 0, lambda: self.role)
+        self._connection.create_function("CURRENT_ACCOUNT", 0, lambda: self.account)
+        self._connection.execute(
+            f"CREATE TABLE INFORMATION_SCHEMA.STREAMLITS ({', '.join(STREAMLITS_COLUMNS)})"
+        )
+        self._connection.execute(
+            f"CREATE TABLE ACCOUNT_USAGE.GRANTS_TO_ROLES ({', '.join(GRANTS_TO_ROLES_COLUMNS)})"
+        )
+        # The session role inherits a parent role, which holds part of the grants
+        self._connection.execute(
+            "INSERT INTO ACCOUNT_USAGE.GRANTS_TO_ROLES VALUES ('USAGE', 'ROLE', ?, NULL, NULL, ?, NULL)",
+            [f"{role}_PARENT", role]
+        )
+
+    @classmethod
+    def with_catalog(cls, app_count, seed=0, **kwargs):
+        """
+        Create a session whose STREAMLITS view holds app_count synthetic apps. Unless an
+        account is given, each catalog size and seed gets its own account name, so catalog
+        snapshots of different synthetic catalogs are never mixed up.
+        """
+        kwargs.setdefault("account", f"LOCAL_{app_count}_{seed}")
+        session = cls(**kwargs)
+        session.seed_streamlits(app_count, seed=seed)
+        return session
+
+    def seed_streamlits(self, app_count, seed=0):
+        """Fill the STREAMLITS view with a reproducible synthetic catalog, and grant the session role most of it"""
+        rng = random.Random(seed)
+        topics = ["Sales", "Finance", "Customer", "Inventory", "Marketing", "Risk", "Supply Chain", "Forecast"]
+        kinds = ["Dashboard", "Explorer", "Report", "Portal", "Monitor", "Planner"]
+        created = datetime(2024, 1, 1)
+        rows = []
+        grants = []
+        for i in range(app_count):
+            database = f"DB_{rng.randrange(max(1, app_count // 250) + 1)}"
+            schema = f"SCHEMA_{rng.randrange(20)}"
+            title = f"{rng.choice(topics)} {rng.choice(kinds)} {i}"
+            rows.append((
+                (created + timedelta(minutes=i)).isoformat(sep=" "),
+                f"APP_{i:06d}",
+                database,
+                schema,
+                title if rng.random() > 0.1 else None,
+                f"{rng.choice(topics).upper().replace(' ', '_')}_TEAM",
+                f"{title} for the {rng.choice(topics).lower()} team",
+                "COMPUTE_WH",
+                f"{rng.getrandbits(128):032x}",
+                "ROLE",
+                f"@{database}.{schema}.APP_STAGE_{i}",
+                "streamlit_app.py"
+            ))
+            if rng.random() < USABLE_APP_SHARE:
+                owned = rng.random() < OWNED_APP_SHARE
+                grantee = self.role if rng.random() < 0.5 else f"{self.role}_PARENT"
+                grants.append(("OWNERSHIP" if owned else "USAGE", "STREAMLIT", f"APP_{i:06d}", database, schema, grantee, None))
+        with self._lock:
+            self._connection.executemany(
+                f"INSERT INTO INFORMATION_SCHEMA.STREAMLITS VALUES ({', '.join('?' for _ in STREAMLITS_COLUMNS)})",
+                rows
+            )
+            self._connection.executemany(
+                f"INSERT INTO ACCOUNT_USAGE.GRANTS_TO_ROLES VALUES ({', '.join('?' for _ in GRANTS_TO_ROLES_COLUMNS)})",
+                grants
+            )
+            self._connection.commit()
+
+    def sql(self, query, params=None):
+        return LocalDataFrame(self, query, params)
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._connection.close()
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _translate(query):
+        """Translate Snowflake SQL the apps issue into SQLite; returns (query, keep_case)"""
+        stripped = query.strip().rstrip(";")
+        if stripped.upper().startswith("SHOW STREAMLITS"):
+            return SHOW_STREAMLITS_QUERY, True
+        translated = stripped.replace("SNOWFLAKE.INFORMATION_SCHEMA.", "INFORMATION_SCHEMA.")
+        translated = translated.replace("SNOWFLAKE.ACCOUNT_USAGE.", "ACCOUNT_USAGE.")
+        return translated, False
+
+    def _execute(self, query, params=None, fetch=True):
+        """Run a query and return (field names, rows)"""
+        if self.closed:
+            raise RuntimeError("Session is closed")
+        translated, keep_case = self._translate(query)
+        if not fetch and translated.lstrip().upper().startswith("SELECT"):
+            translated = f"SELECT * FROM ({translated}) LIMIT 0"
+
+        with self._lock:
+            self.query_count += 1
+            cursor = self._connection.execute(translated, params or [])
+            rows = cursor.fetchall() if fetch else []
+            self._connection.commit()
+
+        # Snowflake upper-cases unquoted identifiers; SHOW output keeps lower-case names
+        fields = [column[0] for column in cursor.description or []]
+        if not keep_case:
+            fields = [field if field.startswith('"') else field.upper() for field in fields]
+        return fields, rows
+
+@functools.lru_cache(maxsize=None)
+def shared_session(app_count, seed=0, user="LOCAL_USER", role="LOCAL_ROLE"):
+    """Process-wide seeded session per catalog size, so reruns do not pay for seeding"""
+    return LocalSession.with_catalog(app_count, seed=seed, user=user, role=role)
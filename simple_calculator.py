@@ -3,13 +3,8 @@
 
 import streamlit as st
 
-# Snowflake connector
-from snowflake.snowpark.context import get_active_session
-
-# Initialize connection
-@st.cache_resource
-def init_connection():
-    return get_active_session()
+# Shared runtime - the Snowflake session is created on first use
+from app_runtime import init_connection, run_app
 
 def main():
     st.title("🧮 Simple Calculator")
@@ -91,7 +86,7 @@ def main():
             st.info(f"|{num1}| = **{result}**")
 
 if __name__ == "__main__":
-    main()
+    run_app("simple_calculator", main)
 
 
 
@@ -2,97 +2,562 @@
 # Create basic charts from sample data
 
 import streamlit as st
-import pandas as pd
 import random
+import re
+from collections import deque
+from datetime import date
 
-# Snowflake connector
-from snowflake.snowpark.context import get_active_session
+# Shared runtime - the Snowflake session and heavy modules are loaded on first use
+from app_runtime import init_connection, lazy_import, leased_session, run_app
 
-# Initialize connection
-@st.cache_resource
-def init_connection():
-    return get_active_session()
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+F = lazy_import("snowflake.snowpark.functions")
+T = lazy_import("snowflake.snowpark.types")
+snowpark_window = lazy_import("snowflake.snowpark.window")
 
-def generate_chart_data(chart_type):
-    """Generate appropriate sample data for different chart types"""
+# Label and value column of each chart type's sample data
+CHART_COLUMNS = {
+    "Bar Chart": ('Category', 'Value'),
+    "Line Chart": ('Month', 'Sales'),
+    "Area Chart": ('Day', 'Traffic')
+}
+
+# Line and area charts can also plot a long generated time series (one point per minute);
+# None is the small sample. Series are downsampled to POINTS_PER_PIXEL points per pixel
+# of chart width before they are drawn.
+SERIES_SIZE_OPTIONS = [None, 10_000, 1_000_000, 5_000_000]
+CHART_WIDTH_OPTIONS = [400, 700, 1000, 1400]
+DEFAULT_CHART_WIDTH = 700
+POINTS_PER_PIXEL = 1
+# Min/max candidates kept per output point before LTTB picks the final points
+MINMAX_CANDIDATES_PER_POINT = 4
+PREVIEW_ROWS = 1000
+
+# Bar charts can also aggregate a generated table of BAR_CATEGORY_COUNT categories or a
+# Snowflake table: a text column becomes the top groups plus "Other", a numeric column
+# becomes histogram bins, and each bar is an aggregate of a value column
+BAR_SIZE_OPTIONS = [None, 100_000, 1_000_000, 10_000_000]
+BAR_CATEGORY_COUNT = 50_000
+AGGREGATE_FUNCTIONS = ['sum', 'mean', 'count', 'min', 'max']
+DEFAULT_TOP_N = 20
+DEFAULT_BIN_COUNT = 20
+OTHER_LABEL = "Other"
+PUSHDOWN_CACHE_TTL_SECONDS = 600
+TABLE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_$"]+(\.[A-Za-z0-9_$"]+){0,2}$')
+
+# Live mode - new points go into a fixed window of the latest LIVE_WINDOW_POINTS, and only
+# the chart and its summary are redrawn every LIVE_REFRESH_SECONDS
+LIVE_WINDOW_POINTS = 600
+LIVE_REFRESH_SECONDS = 1.0
+LIVE_POINTS_PER_REFRESH = 5
+
+@st.cache_resource(max_entries=8)
+def generate_chart_data(chart_type, seed, points=None):
+    """
+    Generate appropriate sample data for different chart types. The same seed always
+    gives the same data; cached per (chart_type, seed, points), callers must not modify it.
+    """
+    label_column, value_column = CHART_COLUMNS[chart_type]
+    
+    if points and chart_type != "Bar Chart":
+        rng = np.random.default_rng(seed)
+        start = pd.Timestamp(date.today()) - pd.Timedelta(minutes=points)
+        return pd.DataFrame({
+            'Time': pd.date_range(start, periods=points, freq='min'),
+            value_column: (50 * np.exp(rng.normal(0, 0.0005, points).cumsum())).round(1)
+        })
+    
+    if points and chart_type == "Bar Chart":
+        rng = np.random.default_rng(seed)
+        # Zipf-distributed categories: a few large groups and a long tail
+        codes = (rng.zipf(1.3, points) - 1) % BAR_CATEGORY_COUNT
+        return pd.DataFrame({
+            'Category': pd.Categorical.from_codes(codes, categories=[f'C{i:05d}' for i in range(BAR_CATEGORY_COUNT)]),
+            'Amount': rng.lognormal(4, 1, points).round(2),
+            'Quantity': rng.integers(1, 21, points)
+        })
+    
+    rng = random.Random(seed)
     
     if chart_type == "Bar Chart":
         categories = ['A', 'B', 'C', 'D', 'E']
-        values = [random.randint(10, 100) for _ in categories]
+        values = [rng.randint(10, 100) for _ in categories]
         return pd.DataFrame({'Category': categories, 'Value': values})
     
     elif chart_type == "Line Chart":
         months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-        values = [random.randint(20, 80) for _ in months]
+        values = [rng.randint(20, 80) for _ in months]
         return pd.DataFrame({'Month': months, 'Sales': values})
     
     elif chart_type == "Area Chart":
         days = [f'Day {i}' for i in range(1, 8)]
-        values = [random.randint(30, 90) for _ in days]
+        values = [rng.randint(30, 90) for _ in days]
         return pd.DataFrame({'Day': days, 'Traffic': values})
 
+def minmax_indices(values, bucket_count):
+    """Positions of the first and last point and of the minimum and maximum of bucket_count equal buckets"""
+    bucket_size = -(-len(values) // bucket_count)
+    buckets = -(-len(values) // bucket_size)
+    padding = buckets * bucket_size - len(values)
+    starts = np.arange(buckets) * bucket_size
+    highs = np.pad(values, (0, padding), constant_values=-np.inf).reshape(buckets, bucket_size).argmax(axis=1)
+    lows = np.pad(values, (0, padding), constant_values=np.inf).reshape(buckets, bucket_size).argmin(axis=1)
+    return np.unique(np.concatenate([[0, len(values) - 1], starts + highs, starts + lows]))
+
+def lttb_indices(x, y, budget):
+    """
+    Largest-Triangle-Three-Buckets: positions of budget points that keep the shape of
+    (x, y). The first and last point are kept; every bucket in between contributes the
+    point forming the largest triangle with the previous pick and the next bucket's average.
+    """
+    if budget >= len(x) or budget < 3:
+        return np.arange(len(x))
+    
+    # budget - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, len(x) - 1, budget - 1).astype(np.intp)
+    counts = np.diff(edges)
+    sum_x = np.concatenate([[0], np.cumsum(x)])
+    sum_y = np.concatenate([[0], np.cumsum(y)])
+    next_x = np.append(((sum_x[edges[1:]] - sum_x[edges[:-1]]) / counts)[1:], x[-1])
+    next_y = np.append(((sum_y[edges[1:]] - sum_y[edges[:-1]]) / counts)[1:], y[-1])
+    
+    selected = np.empty(budget, dtype=np.intp)
+    selected[0], selected[-1] = 0, len(x) - 1
+    previous = 0
+    for bucket in range(budget - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        areas = np.abs(
+            (x[previous] - next_x[bucket]) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (next_y[bucket] - y[previous])
+        )
+        previous = lo + int(areas.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+def downsample_indices(values, budget):
+    """
+    Positions of about budget points of values to plot: min/max bucketing narrows the
+    series to a few candidates per point, then LTTB picks among them. The first highest
+    and lowest points are always kept, so idxmax / idxmin of the result match the series.
+    """
+    if len(values) <= budget:
+        return np.arange(len(values))
+    
+    values = np.asarray(values, dtype=float)
+    candidates = minmax_indices(values, max(1, budget * MINMAX_CANDIDATES_PER_POINT // 2))
+    if len(candidates) > budget:
+        candidates = candidates[lttb_indices(candidates.astype(float), values[candidates], budget)]
+    return np.union1d(candidates, [values.argmax(), values.argmin()])
+
+@st.cache_resource(max_entries=32)
+def downsample_chart_data(chart_type, seed, points, budget):
+    """The chart data of (chart_type, seed, points) reduced to about budget points, cached per series and budget"""
+    data = generate_chart_data(chart_type, seed, points)
+    return data.iloc[downsample_indices(data[CHART_COLUMNS[chart_type][1]].to_numpy(), budget)]
+
+def histogram_bins(low, high, bins, integer):
+    """
+    Width and labels of about bins equal-width bins covering [low, high]; integer columns
+    get whole-number bins. A value falls in bin min(floor((value - low) / width), last).
+    """
+    if integer:
+        low, high = int(low), int(high)
+        width = max(1, -(-(high - low + 1) // bins))
+        count = -(-(high - low + 1) // width)
+        if width == 1:
+            return width, [f"{low + i:,}" for i in range(count)]
+        return width, [f"{low + i * width:,}-{low + (i + 1) * width - 1:,}" for i in range(count)]
+    width = (high - low) / bins or 1.0
+    return width, [f"{low + i * width:,.4g}-{low + (i + 1) * width:,.4g}" for i in range(bins)]
+
+def top_n_partials(partials, agg, top_n):
+    """The top_n groups of partials ranked by agg, and the rest folded into one "Other" group"""
+    ranked = bar_values(partials, agg).sort_values(ascending=False, kind='stable')
+    if len(ranked) <= top_n:
+        return partials.loc[ranked.index]
+    rest = partials.loc[ranked.index[top_n:]]
+    other = pd.DataFrame(
+        {'count': [rest['count'].sum()], 'sum': [rest['sum'].sum()], 'min': [rest['min'].min()], 'max': [rest['max'].max()]},
+        index=[OTHER_LABEL]
+    )
+    return pd.concat([partials.loc[ranked.index[:top_n]], other])
+
+def bar_values(partials, agg):
+    """agg of every group, from its count, sum, min and max"""
+    if agg == 'mean':
+        return partials['sum'] / partials['count']
+    return partials[agg]
+
+def bars_from_partials(partials, agg):
+    """Bar chart data (Category, Value) in bar order"""
+    return pd.DataFrame({'Category': partials.index.astype(str), 'Value': bar_values(partials, agg).to_numpy()})
+
+@st.cache_resource(max_entries=32)
+def aggregate_bar_data(seed, points, group_column, value_column, agg, limit):
+    """
+    Bars of the generated table of (seed, points): agg of value_column per group_column
+    value (top limit groups and "Other"), or per histogram bin for a numeric group_column
+    (limit bins). Computed with vectorized group-bys and cached per chart spec.
+    """
+    data = generate_chart_data("Bar Chart", seed, points)
+    values = pd.Series(data[value_column].to_numpy())
+    keys = data[group_column]
+    
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        # Grouping the category codes avoids hashing millions of strings
+        partials = values.groupby(keys.cat.codes.to_numpy(), sort=False).agg(['count', 'sum', 'min', 'max'])
+        partials.index = keys.cat.categories[partials.index]
+        return bars_from_partials(top_n_partials(partials, agg, limit), agg)
+    
+    keys = keys.to_numpy()
+    integer = np.issubdtype(keys.dtype, np.integer)
+    width, labels = histogram_bins(keys.min(), keys.max(), limit, integer)
+    bins = np.minimum(((keys - keys.min()) // width).astype(np.int64), len(labels) - 1)
+    partials = values.groupby(bins).agg(['count', 'sum', 'min', 'max']).reindex(range(len(labels)))
+    partials[['count', 'sum']] = partials[['count', 'sum']].fillna(0)
+    partials.index = labels
+    return bars_from_partials(partials, agg)
+
+@st.cache_data(ttl=PUSHDOWN_CACHE_TTL_SECONDS, max_entries=64, show_spinner=False)
+def load_table_columns(_session, table_name):
+    """Columns of table_name and their kind: 'integer', 'number', or None for everything else"""
+    with leased_session(_session) as session:
+        columns = {}
+        for field in session.table(table_name).schema.fields:
+            datatype = field.datatype
+            if isinstance(datatype, (T.LongType, T.IntegerType, T.ShortType, T.ByteType)) or (
+                isinstance(datatype, T.DecimalType) and datatype.scale == 0
+            ):
+                columns[field.name] = 'integer'
+            elif isinstance(datatype, (T.DecimalType, T.DoubleType, T.FloatType)):
+                columns[field.name] = 'number'
+            else:
+                columns[field.name] = None
+        return columns
+
+@st.cache_data(ttl=PUSHDOWN_CACHE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def load_bar_data(_session, table_name, group_column, group_kind, value_column, agg, limit):
+    """
+    Bars of a Snowflake table, like aggregate_bar_data but computed in the warehouse:
+    only the per-bar count, sum, min and max come back. Cached per table and chart spec.
+    """
+    with leased_session(_session) as session:
+        table = session.table(table_name).filter(F.col(group_column).is_not_null())
+        key, value = F.col(group_column), F.col(value_column)
+        partial_columns = [
+            F.count(value).alias("COUNT"), F.sum(value).alias("SUM"), F.min(value).alias("MIN"), F.max(value).alias("MAX")
+        ]
+        
+        if group_kind:
+            bounds = table.agg(F.min(key).alias("LOW"), F.max(key).alias("HIGH")).collect()[0]
+            if bounds["LOW"] is None:
+                return bars_from_partials(pd.DataFrame(columns=['count', 'sum', 'min', 'max']), agg)
+            number = int if group_kind == 'integer' else float
+            low, high = number(bounds["LOW"]), number(bounds["HIGH"])
+            width, labels = histogram_bins(low, high, limit, group_kind == 'integer')
+            bins = F.least(F.floor((key - F.lit(low)) / F.lit(width)), F.lit(len(labels) - 1))
+            partials = table.with_column("BAR", bins).group_by("BAR").agg(*partial_columns).to_pandas()
+            partials = partials.set_index(partials["BAR"].astype(int)).drop(columns="BAR")
+            partials.columns = ['count', 'sum', 'min', 'max']
+            partials = partials.astype(float).reindex(range(len(labels)))
+            partials[['count', 'sum']] = partials[['count', 'sum']].fillna(0)
+            partials.index = labels
+            return bars_from_partials(partials, agg)
+        
+        # Rank the groups by the aggregate, then fold everything below the top limit into "Other"
+        scores = {
+            'count': F.col("COUNT"), 'sum': F.col("SUM"), 'min': F.col("MIN"), 'max': F.col("MAX"),
+            'mean': F.col("SUM") / F.col("COUNT")
+        }
+        ranked = table.group_by(key).agg(*partial_columns).with_column(
+            "RANK", F.row_number().over(snowpark_window.Window.order_by(scores[agg].desc_nulls_last()))
+        )
+        labeled = ranked.with_column("BAR", F.iff(F.col("RANK") <= limit, key.cast("string"), F.lit(OTHER_LABEL)))
+        partials = labeled.group_by("BAR").agg(
+            F.sum("COUNT").alias("COUNT"), F.sum("SUM").alias("SUM"), F.min("MIN").alias("MIN"),
+            F.max("MAX").alias("MAX"), F.min("RANK").alias("RANK")
+        ).sort("RANK").to_pandas()
+        partials = partials.set_index("BAR").drop(columns="RANK")
+        partials.columns = ['count', 'sum', 'min', 'max']
+        return bars_from_partials(partials.astype(float), agg)
+
+class LiveSeries:
+    """
+    Random-walk series whose latest capacity points live in preallocated NumPy ring
+    buffers, so memory stays constant however long it runs. The window's max and min
+    are kept in monotonic deques and its mean in a running sum, so every new point
+    updates the summary in constant amortized time instead of rescanning the window.
+    """
+
+    def __init__(self, capacity, seed):
+        self.capacity = capacity
+        self.seed = seed
+        self.appended = 0
+        self._times = np.empty(capacity, dtype='datetime64[ns]')
+        self._values = np.empty(capacity, dtype=float)
+        self._sum = 0.0
+        # (sequence number, value); values decrease along _highs and increase along _lows
+        self._highs = deque()
+        self._lows = deque()
+        self._rng = np.random.default_rng(seed)
+        self._level = 50.0
+
+    def advance(self, count, now):
+        """Append count new points of the walk, spaced over the refresh interval up to now"""
+        steps = self._rng.normal(0, 0.01, count).cumsum()
+        values = (self._level * np.exp(steps)).round(1)
+        self._level *= float(np.exp(steps[-1]))
+        spacing = np.timedelta64(int(LIVE_REFRESH_SECONDS * 1e9 / count), 'ns')
+        times = np.datetime64(now, 'ns') - spacing * np.arange(count - 1, -1, -1)
+        self.extend(times, values)
+
+    def extend(self, times, values):
+        """Append points, overwriting the oldest ones once the window is full"""
+        for time, value in zip(times, values):
+            sequence = self.appended
+            slot = sequence % self.capacity
+            if sequence >= self.capacity:
+                self._sum -= self._values[slot]
+            self._times[slot] = time
+            self._values[slot] = value
+            self._sum += value
+            self.appended += 1
+            
+            # Older points that can no longer be the max / min leave the deques; equal
+            # values stay, so the front is the earliest extreme, like idxmax / idxmin
+            while self._highs and self._highs[-1][1] < value:
+                self._highs.pop()
+            self._highs.append((sequence, value))
+            while self._lows and self._lows[-1][1] > value:
+                self._lows.pop()
+            self._lows.append((sequence, value))
+            oldest = self.appended - self.capacity
+            while self._highs[0][0] < oldest:
+                self._highs.popleft()
+            while self._lows[0][0] < oldest:
+                self._lows.popleft()
+            
+            # Re-add the window once per lap so rounding in the running sum cannot build up
+            if slot == self.capacity - 1:
+                self._sum = float(self._values.sum())
+
+    def __len__(self):
+        return min(self.appended, self.capacity)
+
+    def stats(self):
+        """Max, min and mean of the window, with the times of the max and min"""
+        (high_sequence, high), (low_sequence, low) = self._highs[0], self._lows[0]
+        return {
+            'max': high,
+            'max_time': pd.Timestamp(self._times[high_sequence % self.capacity]),
+            'min': low,
+            'min_time': pd.Timestamp(self._times[low_sequence % self.capacity]),
+            'mean': self._sum / len(self)
+        }
+
+    def frame(self, value_column):
+        """The window, oldest point first"""
+        start = self.appended % self.capacity if self.appended > self.capacity else 0
+        order = (start + np.arange(len(self))) % self.capacity
+        return pd.DataFrame({'Time': self._times[order], value_column: self._values[order]})
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_chart(chart_type):
+    """The live chart and its summary; reruns on its own every LIVE_REFRESH_SECONDS"""
+    series = st.session_state.get('live_series')
+    if series is None or series.seed != st.session_state.chart_seed:
+        series = st.session_state.live_series = LiveSeries(LIVE_WINDOW_POINTS, st.session_state.chart_seed)
+    series.advance(LIVE_POINTS_PER_REFRESH, pd.Timestamp.now())
+    
+    label_column, value_column = CHART_COLUMNS[chart_type]
+    draw_chart = st.line_chart if chart_type == "Line Chart" else st.area_chart
+    draw_chart(series.frame(value_column).set_index('Time')[value_column])
+    st.caption(f"Latest {len(series):,} of {series.appended:,} points")
+    
+    if st.session_state.get('show_data_values', True):
+        stats = series.stats()
+        st.write("**Data Summary:**")
+        st.write(f"• Peak {value_column}: {stats['max']} ({stats['max_time']:%H:%M:%S})")
+        st.write(f"• Lowest {value_column}: {stats['min']} ({stats['min_time']:%H:%M:%S})")
+        st.write(f"• Average: {stats['mean']:.1f}")
+
+def new_chart_data():
+    """Move to the next seed, so the following run draws new data"""
+    st.session_state.chart_seed += 1
+
+def render_bar_data():
+    """
+    Data settings for bar charts. Returns the aggregated bars and a description of
+    them, or (None, None) for the small sample.
+    """
+    with st.expander("Data settings"):
+        source = st.radio("Data source", options=["Sample data", "Snowflake table"], horizontal=True)
+        if source == "Sample data":
+            points = st.selectbox(
+                "Rows",
+                options=BAR_SIZE_OPTIONS,
+                format_func=lambda size: "Sample" if size is None else f"{size:,}"
+            )
+            if points is None:
+                return None, None
+            columns = {'Category': None, 'Amount': 'number', 'Quantity': 'integer'}
+        else:
+            table_name = st.text_input("Table", placeholder="DATABASE.SCHEMA.TABLE").strip()
+            if not table_name:
+                st.info("Enter a table to chart.")
+                st.stop()
+            if not TABLE_NAME_PATTERN.match(table_name):
+                st.error("Enter the table as DATABASE.SCHEMA.TABLE.")
+                st.stop()
+            session = init_connection()
+            try:
+                columns = load_table_columns(session, table_name)
+            except Exception as e:
+                st.error(f"Could not read {table_name}: {e}")
+                st.stop()
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            group_column = st.selectbox("Group by", options=list(columns))
+        with col2:
+            agg = st.selectbox("Aggregate", options=AGGREGATE_FUNCTIONS)
+        with col3:
+            value_column = st.selectbox("Value", options=[column for column, kind in columns.items() if kind])
+        
+        group_kind = columns[group_column]
+        if group_kind:
+            limit = st.slider("Bins", min_value=2, max_value=100, value=DEFAULT_BIN_COUNT)
+        else:
+            limit = st.slider("Top groups", min_value=1, max_value=100, value=DEFAULT_TOP_N)
+    
+    if value_column is None:
+        st.error("The table has no numeric column to aggregate.")
+        st.stop()
+    
+    with st.spinner("Aggregating..."):
+        if source == "Sample data":
+            data = aggregate_bar_data(st.session_state.chart_seed, points, group_column, value_column, agg, limit)
+        else:
+            try:
+                data = load_bar_data(session, table_name, group_column, group_kind, value_column, agg, limit)
+            except Exception as e:
+                st.error(f"Could not aggregate {table_name}: {e}")
+                st.stop()
+    
+    grouping = f"{len(data)} bins of {group_column}" if group_kind else f"the top {limit} {group_column} values and {OTHER_LABEL}"
+    return data, f"{agg.capitalize()} of {value_column} over {grouping}"
+
+def render_chart_options():
+    """Chart customization options; returns whether data values should be shown"""
+    st.subheader("Chart Options")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_data_values = st.checkbox("Show Data Values", value=True, key='show_data_values')
+        
+    with col2:
+        use_custom_colors = st.checkbox("Use Custom Colors", value=False)
+    
+    return show_data_values
+
 def main():
     st.title("📈 Simple Chart Maker")
     st.caption("Create basic charts with sample data")
     
+    # The seed lives in the session, so data only changes on "Generate New Data"
+    if 'chart_seed' not in st.session_state:
+        st.session_state.chart_seed = random.randrange(2**32)
+    
     # Chart type selection
     chart_type = st.selectbox(
         "Select Chart Type",
         options=["Bar Chart", "Line Chart", "Area Chart"]
     )
     
+    live = chart_type != "Bar Chart" and st.toggle(
+        "Live mode",
+        help=f"Stream new points into a window of the latest {LIVE_WINDOW_POINTS} and redraw only the chart"
+    )
+    
+    bar_data, bar_description = render_bar_data() if chart_type == "Bar Chart" else (None, None)
+    
+    points = None
+    chart_width = DEFAULT_CHART_WIDTH
+    if chart_type != "Bar Chart" and not live:
+        with st.expander("Series settings"):
+            settings_col1, settings_col2 = st.columns(2)
+            with settings_col1:
+                points = st.selectbox(
+                    "Points",
+                    options=SERIES_SIZE_OPTIONS,
+                    format_func=lambda size: "Sample" if size is None else f"{size:,}"
+                )
+            with settings_col2:
+                chart_width = st.select_slider("Chart width (px)", options=CHART_WIDTH_OPTIONS, value=DEFAULT_CHART_WIDTH)
+    
+    # Live mode - the fragment redraws the chart and its summary on its own interval
+    if live:
+        st.subheader(f"Live {chart_type}")
+        render_live_chart(chart_type)
+        render_chart_options()
+        st.button("Restart Live Data", type="primary", on_click=new_chart_data)
+        return
+    
     # Generate data for selected chart type
-    data = generate_chart_data(chart_type)
+    data = bar_data if bar_data is not None else generate_chart_data(chart_type, st.session_state.chart_seed, points)
+    label_column, value_column = data.columns
     
     st.subheader(f"Sample Data for {chart_type}")
-    st.dataframe(data, use_container_width=True)
+    st.dataframe(data.head(PREVIEW_ROWS), use_container_width=True)
+    if len(data) > PREVIEW_ROWS:
+        st.caption(f"First {PREVIEW_ROWS:,} of {len(data):,} rows")
     
     # Create and display the chart
     st.subheader(f"Generated {chart_type}")
     
     if chart_type == "Bar Chart":
         st.bar_chart(data.set_index('Category')['Value'])
+        if bar_description:
+            st.caption(bar_description)
         
-    elif chart_type == "Line Chart":
-        st.line_chart(data.set_index('Month')['Sales'])
-        
-    elif chart_type == "Area Chart":
-        st.area_chart(data.set_index('Day')['Traffic'])
+    else:
+        # Only about one point per pixel is sent to the browser
+        plotted = downsample_chart_data(chart_type, st.session_state.chart_seed, points, chart_width * POINTS_PER_PIXEL)
+        draw_chart = st.line_chart if chart_type == "Line Chart" else st.area_chart
+        draw_chart(plotted.set_index(label_column)[value_column], width=chart_width)
+        if len(plotted) < len(data):
+            st.caption(f"Plotting {len(plotted):,} of {len(data):,} points (peaks kept)")
     
-    # Chart customization options
-    st.subheader("Chart Options")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        show_data_values = st.checkbox("Show Data Values", value=True)
-        
-    with col2:
-        use_custom_colors = st.checkbox("Use Custom Colors", value=False)
+    show_data_values = render_chart_options()
     
     if show_data_values:
         st.write("**Data Summary:**")
-        if chart_type == "Bar Chart":
+        if not data[value_column].notna().any():
+            # e.g. an empty table, or a group column that is entirely null
+            st.info("No values to summarize.")
+        
+        elif chart_type == "Bar Chart":
             st.write(f"• Highest: {data['Value'].max()} (Category {data.loc[data['Value'].idxmax(), 'Category']})")
             st.write(f"• Lowest: {data['Value'].min()} (Category {data.loc[data['Value'].idxmin(), 'Category']})")
             st.write(f"• Average: {data['Value'].mean():.1f}")
             
         elif chart_type == "Line Chart":
-            st.write(f"• Peak Sales: {data['Sales'].max()} ({data.loc[data['Sales'].idxmax(), 'Month']})")
-            st.write(f"• Lowest Sales: {data['Sales'].min()} ({data.loc[data['Sales'].idxmin(), 'Month']})")
+            st.write(f"• Peak Sales: {data['Sales'].max()} ({data.loc[data['Sales'].idxmax(), label_column]})")
+            st.write(f"• Lowest Sales: {data['Sales'].min()} ({data.loc[data['Sales'].idxmin(), label_column]})")
             st.write(f"• Average: {data['Sales'].mean():.1f}")
             
         elif chart_type == "Area Chart":
-            st.write(f"• Peak Traffic: {data['Traffic'].max()} ({data.loc[data['Traffic'].idxmax(), 'Day']})")
-            st.write(f"• Lowest Traffic: {data['Traffic'].min()} ({data.loc[data['Traffic'].idxmin(), 'Day']})")
+            st.write(f"• Peak Traffic: {data['Traffic'].max()} ({data.loc[data['Traffic'].idxmax(), label_column]})")
+            st.write(f"• Lowest Traffic: {data['Traffic'].min()} ({data.loc[data['Traffic'].idxmin(), label_column]})")
             st.write(f"• Average: {data['Traffic'].mean():.1f}")
     
-    # Generate new data button
-    if st.button("Generate New Data", type="primary"):
-        st.rerun()
+    # Generate new data button - the callback moves to the next seed before the rerun
+    st.button("Generate New Data", type="primary", on_click=new_chart_data)
 
 if __name__ == "__main__":
-    main()
+    run_app("simple_chart_maker", main)
 
 
 
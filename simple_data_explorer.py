@@ -2,87 +2,482 @@
 # Shows sample data with basic filtering and display options
 
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-import random
-
-# Snowflake connector
-from snowflake.snowpark.context import get_active_session
-
-# Initialize connection
-@st.cache_resource
-def init_connection():
-    return get_active_session()
-
-def generate_sample_data():
-    """Generate some sample data for demonstration"""
-    # Sample sales data
-    data = []
-    regions = ['North', 'South', 'East', 'West']
-    products = ['Widget A', 'Widget B', 'Gadget X', 'Gadget Y', 'Tool Z']
-    
-    for i in range(50):
-        data.append({
-            'Date': (datetime.now() - timedelta(days=random.randint(0, 365))).strftime('%Y-%m-%d'),
-            'Region': random.choice(regions),
-            'Product': random.choice(products),
-            'Sales': random.randint(100, 1000),
-            'Quantity': random.randint(1, 20)
-        })
-    
-    return pd.DataFrame(data)
+import re
+import threading
+from collections import OrderedDict
+from datetime import date
 
-def main():
-    st.title("📊 Simple Data Explorer")
-    st.caption("Explore sample sales data with basic filtering")
-    
-    # Generate sample data
-    df = generate_sample_data()
-    
-    st.subheader("Data Overview")
-    st.write(f"Total records: {len(df)}")
+# Shared runtime - the Snowflake session and heavy modules are loaded on first use
+from app_runtime import init_connection, lazy_import, leased_session, run_app
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+F = lazy_import("snowflake.snowpark.functions")
+
+# Sample data settings - the same (seed, size) always produces the same data
+REGIONS = ['North', 'South', 'East', 'West']
+PRODUCTS = ['Widget A', 'Widget B', 'Gadget X', 'Gadget Y', 'Tool Z']
+SAMPLE_SIZE_OPTIONS = [50, 10_000, 1_000_000, 10_000_000, 50_000_000]
+DEFAULT_SEED = 42
+# Datasets (and their filter and sort indexes) kept per process. 50M rows take about
+# 0.9 GB of data plus up to 1.4 GB of indexes, so only the two most recent are kept.
+SAMPLE_DATA_CACHE_ENTRIES = 2
+
+# Result table paging - only the current page of rows is sent to the browser; sorted
+# filter results are kept per dataset so changing pages is a slice
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250, 1000]
+DEFAULT_PAGE_SIZE = 100
+SORTED_RESULT_CACHE_ENTRIES = 32
+
+# Snowflake table mode - filters and metrics run in the warehouse and only the aggregates
+# and one page of rows come back, cached per table, filter combination and page
+PUSHDOWN_COLUMNS = {
+    'Date': 'DATE',
+    'Region': 'REGION',
+    'Product': 'PRODUCT',
+    'Sales': 'SALES',
+    'Quantity': 'QUANTITY'
+}
+PUSHDOWN_CACHE_TTL_SECONDS = 600
+TABLE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_$"]+(\.[A-Za-z0-9_$"]+){0,2}$')
+
+@st.cache_resource(max_entries=SAMPLE_DATA_CACHE_ENTRIES)
+def generate_sample_data(seed=DEFAULT_SEED, size=50):
+    """
+    Generate sample sales data, one vectorized draw per column. Region and Product are
+    categoricals and Date is a native datetime column, so tens of millions of rows stay
+    compact. Cached per (seed, size); callers must not modify the returned frame.
+    """
+    rng = np.random.default_rng(seed)
+    today = np.datetime64(date.today(), 'D')
     
-    # Simple filters
+    return pd.DataFrame({
+        'Date': (today - rng.integers(0, 366, size).astype('timedelta64[D]')).astype('datetime64[ns]'),
+        'Region': pd.Categorical.from_codes(rng.integers(0, len(REGIONS), size, dtype=np.int8), categories=REGIONS),
+        'Product': pd.Categorical.from_codes(rng.integers(0, len(PRODUCTS), size, dtype=np.int8), categories=PRODUCTS),
+        'Sales': rng.integers(100, 1001, size, dtype=np.int32),
+        'Quantity': rng.integers(1, 21, size, dtype=np.int32)
+    })
+
+class FilterIndex:
+    """
+    Row positions grouped by value for categorical columns, built once per dataset.
+    A filter starts from the smallest matching posting list and checks the remaining
+    filters against the category codes of just those rows, so no frame is copied or scanned.
+    """
+
+    def __init__(self, df, columns):
+        self.row_count = len(df)
+        self._codes = {}
+        self._postings = {}
+        self._combinations = {}
+        self._lock = threading.Lock()
+        for column in columns:
+            values = df[column] if isinstance(df[column].dtype, pd.CategoricalDtype) else df[column].astype('category')
+            codes = np.asarray(values.cat.codes)
+            categories = list(values.cat.categories)
+            
+            # A stable sort groups positions by code while keeping each group in row order
+            order = np.argsort(codes, kind='stable')
+            # Positions fit in int32 for every offered size, which halves the index memory
+            if len(order) <= np.iinfo(np.int32).max:
+                order = order.astype(np.int32)
+            counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+            bounds = np.cumsum(np.concatenate([[np.count_nonzero(codes < 0)], counts]))
+            
+            self._codes[column] = (codes, {value: code for code, value in enumerate(categories)})
+            self._postings[column] = {
+                value: order[bounds[code]:bounds[code + 1]]
+                for code, value in enumerate(categories)
+                if counts[code]
+            }
+
+    def options(self, column):
+        """Values of column that occur in the data, sorted"""
+        return sorted(self._postings[column])
+
+    def lookup(self, filters):
+        """
+        Row positions (ascending) matching every column == value in filters; 'All' means
+        no filter on that column. Returns None when nothing is filtered.
+        """
+        active = {column: value for column, value in filters.items() if value != 'All'}
+        if not active:
+            return None
+        
+        postings = {column: self._postings[column].get(value) for column, value in active.items()}
+        if any(posting is None for posting in postings.values()):
+            return np.empty(0, dtype=np.int32)
+        
+        if len(active) == 1:
+            return next(iter(postings.values()))
+        
+        # Combinations are intersected once and remembered; they partition the rows, so
+        # all of them together hold at most one position per row
+        key = tuple(sorted(active.items()))
+        with self._lock:
+            positions = self._combinations.get(key)
+        if positions is None:
+            first = min(postings, key=lambda column: len(postings[column]))
+            positions = postings[first]
+            for column, value in active.items():
+                if column != first:
+                    codes, code_of = self._codes[column]
+                    positions = positions[codes[positions] == code_of[value]]
+            with self._lock:
+                self._combinations[key] = positions
+        return positions
+
+@st.cache_resource(max_entries=SAMPLE_DATA_CACHE_ENTRIES)
+def get_filter_index(seed, size):
+    """Region/Product filter index for the sample data of (seed, size)"""
+    return FilterIndex(generate_sample_data(seed, size), ['Region', 'Product'])
+
+class SortIndex:
+    """
+    Row order per column, computed once per dataset with a stable argsort. A filtered
+    result is put in order by walking the column order and keeping the rows in the filter,
+    which is linear and never re-sorts, and recent sorted results are remembered so
+    changing pages only slices positions.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self._orders = {}
+        self._sorted = OrderedDict()
+        self._lock = threading.Lock()
+
+    def order(self, column):
+        """Row positions sorted ascending by column, ties in row order; categoricals sort by label"""
+        with self._lock:
+            order = self._orders.get(column)
+        if order is None:
+            values = self._df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                label_ranks = np.argsort(np.argsort(np.asarray(values.cat.categories, dtype=object)))
+                keys = label_ranks[np.asarray(values.cat.codes)]
+            else:
+                keys = values.to_numpy()
+            order = np.argsort(keys, kind='stable')
+            # Positions fit in int32 for every offered size, which halves the memory per column
+            if len(order) <= np.iinfo(np.int32).max:
+                order = order.astype(np.int32)
+            with self._lock:
+                self._orders[column] = order
+        return order
+
+    def sorted_positions(self, filter_key, positions, column, descending=False):
+        """
+        Positions (None for all rows) ordered by column. filter_key identifies the
+        filter that produced positions and keys the cache of sorted results.
+        """
+        order = self.order(column)
+        if positions is None:
+            ordered = order
+        else:
+            key = (filter_key, column)
+            with self._lock:
+                ordered = self._sorted.get(key)
+                if ordered is not None:
+                    self._sorted.move_to_end(key)
+            if ordered is None:
+                in_filter = np.zeros(len(order), dtype=bool)
+                in_filter[positions] = True
+                ordered = order[in_filter[order]]
+                with self._lock:
+                    self._sorted[key] = ordered
+                    while len(self._sorted) > SORTED_RESULT_CACHE_ENTRIES:
+                        self._sorted.popitem(last=False)
+        return ordered[::-1] if descending else ordered
+
+@st.cache_resource(max_entries=SAMPLE_DATA_CACHE_ENTRIES)
+def get_sort_index(seed, size):
+    """Per-column sort orders for the sample data of (seed, size)"""
+    return SortIndex(generate_sample_data(seed, size))
+
+class AggregateCube:
+    """
+    Region x Product cube of row counts, Sales sums and Quantity sums, with an extra
+    "All" row and column holding the rollups. Any filter combination is one cell
+    lookup, the mean is sum / count, and appended rows are added to the cells they fall
+    in instead of rebuilding the cube.
+    """
+
+    def __init__(self, regions, products):
+        self.regions = list(regions)
+        self.products = list(products)
+        self._region_codes = {value: code for code, value in enumerate(self.regions)}
+        self._product_codes = {value: code for code, value in enumerate(self.products)}
+        # The last row / column is the "All" margin
+        shape = (len(self.regions) + 1, len(self.products) + 1)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.sales = np.zeros(shape, dtype=np.int64)
+        self.quantity = np.zeros(shape, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df):
+        cube = cls(df['Region'].cat.categories, df['Product'].cat.categories)
+        cube.append(df)
+        return cube
+
+    def _codes(self, values, categories, column):
+        codes = np.asarray(pd.Categorical(values, categories=categories).codes)
+        if (codes < 0).any():
+            raise ValueError(f"Rows with {column} values outside the cube; rebuild it with from_frame()")
+        return codes
+
+    def append(self, rows):
+        """Add rows (Region, Product, Sales, Quantity) to the cube, cells and margins alike"""
+        cells = len(self.regions) * len(self.products)
+        keys = (
+            self._codes(rows['Region'], self.regions, 'Region').astype(np.int64) * len(self.products)
+            + self._codes(rows['Product'], self.products, 'Product')
+        )
+        shape = (len(self.regions), len(self.products))
+        deltas = [
+            np.bincount(keys, minlength=cells).reshape(shape),
+            np.bincount(keys, weights=rows['Sales'].to_numpy(), minlength=cells).round().astype(np.int64).reshape(shape),
+            np.bincount(keys, weights=rows['Quantity'].to_numpy(), minlength=cells).round().astype(np.int64).reshape(shape)
+        ]
+        with self._lock:
+            for totals, delta in zip((self.counts, self.sales, self.quantity), deltas):
+                totals[:-1, :-1] += delta
+                totals[:-1, -1] += delta.sum(axis=1)
+                totals[-1, :-1] += delta.sum(axis=0)
+                totals[-1, -1] += delta.sum()
+
+    def lookup(self, selected_region, selected_product):
+        """(row count, total sales, total quantity) for a filter combination ('All' for no filter)"""
+        row = len(self.regions) if selected_region == 'All' else self._region_codes.get(selected_region)
+        column = len(self.products) if selected_product == 'All' else self._product_codes.get(selected_product)
+        if row is None or column is None:
+            return 0, 0, 0
+        with self._lock:
+            return int(self.counts[row, column]), int(self.sales[row, column]), int(self.quantity[row, column])
+
+@st.cache_resource(max_entries=4)
+def get_aggregate_cube(seed, size):
+    """Region x Product aggregate cube for the sample data of (seed, size)"""
+    return AggregateCube.from_frame(generate_sample_data(seed, size))
+
+def pushdown_table(session, table_name, selected_region, selected_product):
+    """Snowpark DataFrame over table_name with the Region/Product filters applied"""
+    table = session.table(table_name)
+    if selected_region != 'All':
+        table = table.filter(F.col(PUSHDOWN_COLUMNS['Region']) == selected_region)
+    if selected_product != 'All':
+        table = table.filter(F.col(PUSHDOWN_COLUMNS['Product']) == selected_product)
+    return table
+
+@st.cache_data(ttl=PUSHDOWN_CACHE_TTL_SECONDS, max_entries=64, show_spinner=False)
+def load_pushdown_options(_session, table_name, column):
+    """Distinct values of a filter column, computed in the warehouse"""
+    with leased_session(_session) as session:
+        source = F.col(PUSHDOWN_COLUMNS[column])
+        rows = session.table(table_name).filter(source.is_not_null()).select(source).distinct().sort(source).collect()
+        return [str(row[0]) for row in rows]
+
+@st.cache_data(ttl=PUSHDOWN_CACHE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def load_pushdown_totals(_session, table_name, selected_region, selected_product):
+    """Row count, total sales, total quantity and average sale for one filter combination"""
+    with leased_session(_session) as session:
+        sales = F.col(PUSHDOWN_COLUMNS['Sales'])
+        table = pushdown_table(session, table_name, selected_region, selected_product)
+        return table.agg(
+            F.count(F.lit(1)).alias("ROW_COUNT"),
+            F.sum(sales).alias("TOTAL_SALES"),
+            F.sum(F.col(PUSHDOWN_COLUMNS['Quantity'])).alias("TOTAL_QUANTITY"),
+            F.avg(sales).alias("AVG_SALE")
+        ).collect()[0].asDict()
+
+@st.cache_data(ttl=PUSHDOWN_CACHE_TTL_SECONDS, max_entries=256, show_spinner=False)
+def load_pushdown_page(_session, table_name, selected_region, selected_product, sort_column, descending, offset, page_size):
+    """One page of matching rows in sort_column order, with the sample data column names"""
+    with leased_session(_session) as session:
+        table = pushdown_table(session, table_name, selected_region, selected_product)
+        # The remaining columns break ties, so rows do not move between pages across queries
+        sort_key = F.col(PUSHDOWN_COLUMNS[sort_column])
+        tie_breakers = [F.col(source) for column, source in PUSHDOWN_COLUMNS.items() if column != sort_column]
+        page_df = (
+            table.sort([sort_key.desc() if descending else sort_key.asc()] + tie_breakers)
+            .limit(page_size, offset=offset)
+            .select([F.col(source) for source in PUSHDOWN_COLUMNS.values()])
+            .to_pandas()
+        )
+        page_df.columns = list(PUSHDOWN_COLUMNS)
+        return page_df
+
+def render_filters(region_options, product_options):
+    """Region and Product filters; returns the selected values ('All' for no filter)"""
     col1, col2 = st.columns(2)
     
     with col1:
         selected_region = st.selectbox(
             "Filter by Region",
-            options=['All'] + sorted(df['Region'].unique().tolist())
+            options=['All'] + region_options
         )
     
     with col2:
         selected_product = st.selectbox(
             "Filter by Product", 
-            options=['All'] + sorted(df['Product'].unique().tolist())
+            options=['All'] + product_options
         )
     
-    # Apply filters
-    filtered_df = df.copy()
-    if selected_region != 'All':
-        filtered_df = filtered_df[filtered_df['Region'] == selected_region]
-    if selected_product != 'All':
-        filtered_df = filtered_df[filtered_df['Product'] == selected_product]
+    return selected_region, selected_product
+
+def render_page_controls(row_count, sort_options, descending=False):
+    """
+    Sort, order, page size and page controls for a result of row_count rows; the first
+    sort option is the default. Returns (sort column, descending, offset, page size).
+    """
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        sort_column = st.selectbox("Sort by", options=sort_options, format_func=lambda column: column or "Row order")
+    
+    with col2:
+        order = st.selectbox("Order", options=["Ascending", "Descending"], index=1 if descending else 0)
+    
+    with col3:
+        page_size = st.selectbox("Rows per page", options=PAGE_SIZE_OPTIONS, index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE))
+    
+    page_count = max(1, -(-row_count // page_size))
+    with col4:
+        # Keyed on the result and ordering so a new result starts at page 1
+        page = st.number_input(
+            f"Page (of {page_count:,})",
+            min_value=1,
+            max_value=page_count,
+            value=1,
+            key=f"result_page_{row_count}_{page_size}_{sort_column}_{order}"
+        )
+    
+    return sort_column, order == "Descending", (page - 1) * page_size, page_size
+
+def render_result_page(page_df, offset, row_count):
+    """One page of result rows, with its position in the result"""
+    st.dataframe(
+        page_df,
+        column_config={'Date': st.column_config.DateColumn("Date")},
+        use_container_width=True
+    )
+    if row_count:
+        st.caption(f"Showing rows {offset + 1:,}-{offset + len(page_df):,} of {row_count:,}")
+
+def render_metrics(total_sales, total_quantity, avg_sale):
+    """Total Sales, Total Quantity and Avg Sale metrics"""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Total Sales", f"${total_sales:,}")
+    
+    with col2:
+        st.metric("Total Quantity", f"{total_quantity}")
+    
+    with col3:
+        st.metric("Avg Sale", f"${avg_sale:.0f}")
+
+def explore_sample_data():
+    """Explore generated sample data in the app"""
+    # Generate sample data (cached, so reruns and filter changes reuse the same frame)
+    with st.expander("Sample data settings"):
+        settings_col1, settings_col2 = st.columns(2)
+        with settings_col1:
+            size = st.selectbox("Rows", options=SAMPLE_SIZE_OPTIONS, format_func=lambda rows: f"{rows:,}")
+        with settings_col2:
+            seed = st.number_input("Seed", min_value=0, value=DEFAULT_SEED, step=1)
+    
+    df = generate_sample_data(int(seed), size)
+    filter_index = get_filter_index(int(seed), size)
+    sort_index = get_sort_index(int(seed), size)
+    
+    st.subheader("Data Overview")
+    st.write(f"Total records: {len(df)}")
     
-    # Display results
+    # Simple filters
+    selected_region, selected_product = render_filters(filter_index.options('Region'), filter_index.options('Product'))
+    
+    # Apply filters from the index - positions of the matching rows, no frame is copied
+    positions = filter_index.lookup({'Region': selected_region, 'Product': selected_product})
+    row_count = len(df) if positions is None else len(positions)
+    
+    # Display results - only the rows of the current page are taken from the frame
     st.subheader("Filtered Data")
-    st.dataframe(filtered_df, use_container_width=True)
+    sort_column, descending, offset, page_size = render_page_controls(row_count, [None] + list(df.columns))
+    if sort_column is not None:
+        positions = sort_index.sorted_positions((selected_region, selected_product), positions, sort_column, descending)
+    elif descending:
+        # Row order, descending - the matching rows last to first, without copying them
+        positions = range(len(df) - 1, -1, -1) if positions is None else positions[::-1]
+    if positions is None:
+        page_df = df.iloc[offset:offset + page_size]
+    else:
+        page_df = df.iloc[positions[offset:offset + page_size]]
+    render_result_page(page_df, offset, row_count)
+    
+    # Simple metrics - one lookup in the precomputed cube, whatever the row count
+    row_count, total_sales, total_quantity = get_aggregate_cube(int(seed), size).lookup(selected_region, selected_product)
+    if row_count:
+        render_metrics(total_sales, total_quantity, total_sales / row_count)
+
+def explore_snowflake_table():
+    """Explore a Snowflake table with filters and metrics pushed down to the warehouse"""
+    table_name = st.text_input(
+        "Table",
+        placeholder="DATABASE.SCHEMA.TABLE",
+        help=f"Needs the columns {', '.join(PUSHDOWN_COLUMNS.values())}"
+    ).strip()
+    if not table_name:
+        st.info("Enter a table to explore.")
+        return
+    if not TABLE_NAME_PATTERN.match(table_name):
+        st.error("Enter the table as DATABASE.SCHEMA.TABLE.")
+        return
+    
+    session = init_connection()
+    try:
+        region_options = load_pushdown_options(session, table_name, 'Region')
+        product_options = load_pushdown_options(session, table_name, 'Product')
+        overview = load_pushdown_totals(session, table_name, 'All', 'All')
+    except Exception as e:
+        st.error(f"Could not read {table_name}: {e}")
+        return
+    
+    st.subheader("Data Overview")
+    st.write(f"Total records: {overview['ROW_COUNT']}")
+    
+    # Simple filters (evaluated in the warehouse)
+    selected_region, selected_product = render_filters(region_options, product_options)
+    
+    with st.spinner("Querying Snowflake..."):
+        totals = load_pushdown_totals(session, table_name, selected_region, selected_product)
+    
+    # Display results - the warehouse sorts and returns only the current page, newest first by default
+    st.subheader("Filtered Data")
+    sort_column, descending, offset, page_size = render_page_controls(totals['ROW_COUNT'], list(PUSHDOWN_COLUMNS), descending=True)
+    with st.spinner("Querying Snowflake..."):
+        page_df = load_pushdown_page(
+            session, table_name, selected_region, selected_product, sort_column, descending, offset, page_size
+        )
+    render_result_page(page_df, offset, totals['ROW_COUNT'])
     
     # Simple metrics
-    if not filtered_df.empty:
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Total Sales", f"${filtered_df['Sales'].sum():,}")
-        
-        with col2:
-            st.metric("Total Quantity", f"{filtered_df['Quantity'].sum()}")
-        
-        with col3:
-            st.metric("Avg Sale", f"${filtered_df['Sales'].mean():.0f}")
+    if totals['ROW_COUNT']:
+        render_metrics(totals['TOTAL_SALES'], totals['TOTAL_QUANTITY'], totals['AVG_SALE'])
+
+def main():
+    st.title("📊 Simple Data Explorer")
+    st.caption("Explore sample sales data with basic filtering")
+    
+    source = st.radio("Data source", options=["Sample data", "Snowflake table"], horizontal=True)
+    if source == "Snowflake table":
+        explore_snowflake_table()
+    else:
+        explore_sample_data()
 
 if __name__ == "__main__":
-    main()
+    run_app("simple_data_explorer", main)
 
 
 
@@ -4,13 +4,8 @@
 import streamlit as st
 from datetime import datetime
 
-# Snowflake connector
-from snowflake.snowpark.context import get_active_session
-
-# Initialize connection
-@st.cache_resource
-def init_connection():
-    return get_active_session()
+# Shared runtime - the Snowflake session is created on first use
+from app_runtime import init_connection, run_app
 
 def main():
     st.title("📝 Simple Survey Form")
@@ -132,7 +127,7 @@ def main():
                 st.info("Thank you for your feedback! Your responses help us improve our services.")
 
 if __name__ == "__main__":
-    main()
+    run_app("simple_survey_form", main)
 
 
 
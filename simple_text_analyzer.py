@@ -2,36 +2,78 @@
 # Analyze text with basic statistics and word analysis
 
 import streamlit as st
+import heapq
 import re
-from collections import Counter
+import string
+import threading
+from collections import Counter, OrderedDict, namedtuple
 
-# Snowflake connector
-from snowflake.snowpark.context import get_active_session
+# Shared runtime - the Snowflake session and heavy modules are loaded on first use
+from app_runtime import init_connection, lazy_import, run_app
 
-# Initialize connection
-@st.cache_resource
-def init_connection():
-    return get_active_session()
+pd = lazy_import("pandas")
+
+# Words are runs of \w characters, counted case-insensitively
+WORD_PATTERN = re.compile(r'\w+')
+
+# ASCII fast path: \w in ASCII text is exactly these characters, so one translate turns the
+# text into its lower-case words separated by spaces, and split() tokenizes it far faster
+# than the regex
+ASCII_WORD_CHARACTERS = set(string.ascii_letters + string.digits + '_')
+ASCII_WORDS_TABLE = str.maketrans({
+    code: chr(code).lower() if chr(code) in ASCII_WORD_CHARACTERS else ' ' for code in range(128)
+})
+# Marks ASCII whitespace ' ' and everything else 'x', so every ' x' starts a split() token
+ASCII_TOKENS_TABLE = str.maketrans({code: ' ' if chr(code).isspace() else 'x' for code in range(128)})
+
+# Incremental analysis - the text is split at blank-line paragraph breaks, which no word,
+# token or line statistic crosses, and each paragraph's partial result is cached
+PARAGRAPH_SEPARATOR = '\n\n'
+PARAGRAPH_CACHE_ENTRIES = 20_000
+# The cache is also bounded by the paragraph text it holds (in characters), and paragraphs
+# longer than PARAGRAPH_CACHE_MAX_PARAGRAPH_CHARS are analyzed without being cached, so a
+# few huge paragraphs re-analyzed on every edit cannot fill memory
+PARAGRAPH_CACHE_MAX_CHARS = 20_000_000
+PARAGRAPH_CACHE_MAX_PARAGRAPH_CHARS = 100_000
+MOST_COMMON_WORDS = 5
+
+# Statistics of one paragraph, merged into the statistics of the whole text
+ParagraphStats = namedtuple(
+    "ParagraphStats",
+    ["char_count", "space_count", "newline_count", "word_count", "has_text", "word_counts", "word_total", "word_length"]
+)
+
+def tokenize(text):
+    """(number of split() tokens, list of lower-case words) of text"""
+    if text.isascii():
+        marks = text.translate(ASCII_TOKENS_TABLE)
+        return marks.count(' x') + marks.startswith('x'), text.translate(ASCII_WORDS_TABLE).split()
+    return len(text.split()), WORD_PATTERN.findall(text.lower())
 
 def analyze_text(text):
-    """Analyze text and return various statistics"""
-    if not text.strip():
+    """
+    Analyze text and return various statistics. Character, line and token counts are
+    counted in place; the words are tokenized once and everything else comes from
+    their Counter.
+    """
+    if not text or text.isspace():
         return None
     
     # Basic stats
     char_count = len(text)
-    char_count_no_spaces = len(text.replace(' ', ''))
-    word_count = len(text.split())
-    line_count = len(text.split('\n'))
-    paragraph_count = len([p for p in text.split('\n\n') if p.strip()])
+    char_count_no_spaces = char_count - text.count(' ')
+    line_count = text.count('\n') + 1
+    paragraph_count = sum(1 for paragraph in text.split('\n\n') if paragraph and not paragraph.isspace())
     
     # Word analysis
-    words = re.findall(r'\b\w+\b', text.lower())
-    unique_words = len(set(words))
-    most_common_words = Counter(words).most_common(5)
+    word_count, words = tokenize(text)
+    word_counts = Counter(words)
+    unique_words = len(word_counts)
+    most_common_words = word_counts.most_common(MOST_COMMON_WORDS)
     
     # Average calculations
-    avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+    total_word_length = sum(len(word) * count for word, count in word_counts.items())
+    avg_word_length = total_word_length / len(words) if words else 0
     avg_words_per_line = word_count / line_count if line_count > 0 else 0
     
     return {
@@ -46,6 +88,189 @@ def analyze_text(text):
         'avg_words_per_line': avg_words_per_line
     }
 
+def analyze_paragraph(paragraph):
+    """Partial statistics of one paragraph (a piece of the text between paragraph breaks)"""
+    word_count, words = tokenize(paragraph)
+    word_counts = Counter(words)
+    return ParagraphStats(
+        char_count=len(paragraph),
+        space_count=paragraph.count(' '),
+        newline_count=paragraph.count('\n'),
+        word_count=word_count,
+        has_text=bool(paragraph) and not paragraph.isspace(),
+        word_counts=word_counts,
+        word_total=len(words),
+        word_length=sum(len(word) * count for word, count in word_counts.items())
+    )
+
+class ParagraphCache:
+    """
+    Thread-safe LRU of ParagraphStats keyed by paragraph text, shared by every session,
+    bounded by entry count and by total paragraph length
+    """
+
+    def __init__(self, max_entries, max_chars=PARAGRAPH_CACHE_MAX_CHARS, max_paragraph_chars=PARAGRAPH_CACHE_MAX_PARAGRAPH_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.max_paragraph_chars = max_paragraph_chars
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def get(self, paragraph):
+        """ParagraphStats of paragraph, analyzing it only on a miss"""
+        with self._lock:
+            stats = self._entries.get(paragraph)
+            if stats is not None:
+                self._entries.move_to_end(paragraph)
+                self.hits += 1
+                return stats
+            self.misses += 1
+        stats = analyze_paragraph(paragraph)
+        with self._lock:
+            if len(paragraph) > self.max_paragraph_chars:
+                self.uncached += 1
+                return stats
+            if paragraph not in self._entries:
+                self._chars += len(paragraph)
+            self._entries[paragraph] = stats
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                evicted, _ = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+        return stats
+
+    def stats(self):
+        """Return hit/miss counters for display"""
+        with self._lock:
+            return {
+                "entries": len(self._entries), "chars": self._chars, "hits": self.hits,
+                "misses": self.misses, "uncached": self.uncached
+            }
+
+@st.cache_resource
+def get_paragraph_cache():
+    """Process-wide paragraph cache"""
+    return ParagraphCache(PARAGRAPH_CACHE_ENTRIES)
+
+class IncrementalTextAnalysis:
+    """
+    Statistics of a text that is edited between runs. The paragraphs that changed since
+    the last update (between the unchanged leading and trailing ones) are looked up in the
+    paragraph cache, and only their partials are subtracted from and added to the running
+    totals, so an edit costs about the size of the edited paragraphs. The result is
+    identical to analyze_text on the whole text.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._paragraphs = []
+        self._partials = []
+        # Sums of every ParagraphStats field except the word counts
+        self._totals = dict.fromkeys([field for field in ParagraphStats._fields if field != "word_counts"], 0)
+        self._word_counts = {}
+        self.reanalyzed = 0
+
+    def _apply(self, partial, sign):
+        """Add (sign 1) or remove (sign -1) a paragraph's partial from the totals"""
+        for field in self._totals:
+            self._totals[field] += sign * getattr(partial, field)
+        word_counts = self._word_counts
+        for word, count in partial.word_counts.items():
+            total = word_counts.get(word, 0) + sign * count
+            if total:
+                word_counts[word] = total
+            else:
+                del word_counts[word]
+
+    def update(self, text):
+        """Bring the totals up to date with text and return its analysis (None for blank text)"""
+        paragraphs = text.split(PARAGRAPH_SEPARATOR)
+        previous = self._paragraphs
+        shared = min(len(previous), len(paragraphs))
+        prefix = 0
+        while prefix < shared and previous[prefix] == paragraphs[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shared - prefix and previous[-1 - suffix] == paragraphs[-1 - suffix]:
+            suffix += 1
+        
+        changed = [self._cache.get(paragraph) for paragraph in paragraphs[prefix:len(paragraphs) - suffix]]
+        for partial in self._partials[prefix:len(previous) - suffix]:
+            self._apply(partial, -1)
+        for partial in changed:
+            self._apply(partial, 1)
+        self._partials[prefix:len(previous) - suffix] = changed
+        self._paragraphs = paragraphs
+        self.reanalyzed = len(changed)
+        
+        if not self._totals["has_text"]:
+            return None
+        return self.result()
+
+    def most_common_words(self, n=MOST_COMMON_WORDS):
+        """
+        Counter.most_common(n) of the whole text's words: highest counts first, ties in
+        order of first occurrence. Only the words that can make the list are ordered, by
+        walking the paragraphs until their first occurrences are all found.
+        """
+        word_counts = self._word_counts
+        if not word_counts:
+            return []
+        top = heapq.nlargest(n, word_counts.values())
+        threshold = top[-1]
+        greater = sum(1 for count in top if count > threshold)
+        ties = len(top) - greater
+        
+        ranked = []
+        seen = set()
+        for partial in self._partials:
+            for word in partial.word_counts:
+                count = word_counts[word]
+                if count < threshold or word in seen:
+                    continue
+                seen.add(word)
+                if count > threshold:
+                    ranked.append(word)
+                    greater -= 1
+                elif ties:
+                    ranked.append(word)
+                    ties -= 1
+                if not greater and not ties:
+                    break
+            if not greater and not ties:
+                break
+        
+        # sorted() is stable, so equal counts stay in first-occurrence order
+        ranked.sort(key=lambda word: word_counts[word], reverse=True)
+        return [(word, word_counts[word]) for word in ranked]
+
+    def result(self):
+        """The analyze_text dict of the current text"""
+        totals = self._totals
+        breaks = len(self._paragraphs) - 1
+        char_count = totals["char_count"] + len(PARAGRAPH_SEPARATOR) * breaks
+        line_count = totals["newline_count"] + PARAGRAPH_SEPARATOR.count('\n') * breaks + 1
+        return {
+            'char_count': char_count,
+            'char_count_no_spaces': char_count - totals["space_count"],
+            'word_count': totals["word_count"],
+            'line_count': line_count,
+            'paragraph_count': totals["has_text"],
+            'unique_words': len(self._word_counts),
+            'most_common_words': self.most_common_words(),
+            'avg_word_length': totals["word_length"] / totals["word_total"] if totals["word_total"] else 0,
+            'avg_words_per_line': totals["word_count"] / line_count if line_count > 0 else 0
+        }
+
+def get_text_analysis():
+    """This browser session's incremental analysis"""
+    if 'text_analysis' not in st.session_state:
+        st.session_state.text_analysis = IncrementalTextAnalysis(get_paragraph_cache())
+    return st.session_state.text_analysis
+
 def main():
     st.title("📝 Simple Text Analyzer")
     st.caption("Analyze your text with basic statistics and insights")
@@ -77,7 +302,8 @@ def main():
     
     # Analysis section
     if text_to_analyze.strip():
-        analysis = analyze_text(text_to_analyze)
+        # Only the paragraphs edited since the last run are analyzed again
+        analysis = get_text_analysis().update(text_to_analyze)
         
         if analysis:
             st.subheader("Text Analysis Results")
@@ -116,7 +342,6 @@ def main():
                 st.table(word_data)
                 
                 # Display as bar chart
-                import pandas as pd
                 df = pd.DataFrame(word_data)
                 st.bar_chart(df.set_index('Word')['Count'])
             
@@ -183,7 +408,7 @@ def main():
         st.info("👆 Enter some text above to see the analysis results")
 
 if __name__ == "__main__":
-    main()
+    run_app("simple_text_analyzer", main)
 
 
 
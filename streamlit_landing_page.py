@@ -1,38 +1,567 @@
 # Streamlit Landing Page - User-Specific App Access
 # This application shows users only the Streamlit applications they have access to
 
+import atexit
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
-# Snowflake connector for Streamlit in Snowflake
-from snowflake.snowpark.context import get_active_session
+# Shared runtime - the Snowflake session is created (and Snowpark imported) on first use,
+# and pyarrow is only imported once a catalog snapshot is read or written
+from app_runtime import PooledSession, get_startup_timings, init_connection, lazy_import, leased_session, run_app
+
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+# Catalog cache settings - the catalog is cached per (account, role) so that widget
+# interactions do not re-run the catalog queries against the warehouse
+CATALOG_CACHE_TTL_SECONDS = 300
+CATALOG_CACHE_MAX_ENTRIES = 256
+
+# Catalog strategies in order of preference. On a cold start they are probed
+# concurrently and the first one returning apps is remembered per role.
+CATALOG_STRATEGIES = {
+    "account_streamlits": "SELECT * FROM SNOWFLAKE.INFORMATION_SCHEMA.STREAMLITS",
+    "database_streamlits": "SELECT * FROM INFORMATION_SCHEMA.STREAMLITS",
+    "show_streamlits": "SHOW STREAMLITS"
+}
+CATALOG_PROBE_WORKERS = 3
+
+# User context query - on the first load of a session it is submitted asynchronously
+USER_CONTEXT_QUERY = "SELECT CURRENT_USER() as username, CURRENT_ROLE() as current_role, CURRENT_ACCOUNT() as account"
+
+# A strategy that fails this many times in a row is skipped for the cooldown period
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = 600
+
+# Static base URL for your Snowflake environment - app URLs append the streamlit name
+STREAMLIT_BASE_URL = "https://app.snowflake.com/sfsenorthamerica/demo387/#/streamlit-apps/STREAMLIT_APPS.LANDING_PAGE"
+
+# App list rendering - only the rows on the current page are sent to the browser
+APP_PAGE_SIZE_OPTIONS = [25, 50, 100, 250]
+CARD_VIEW_MAX_APPS = 100
+
+# Search ranking - matches in the app name count more than matches in the description
+SEARCH_FIELD_WEIGHTS = {
+    'APP_NAME': 5.0,
+    'OWNER': 2.0,
+    'DATABASE_NAME': 1.5,
+    'SCHEMA_NAME': 1.5,
+    'DESCRIPTION': 1.0
+}
+SEARCH_PREFIX_FACTOR = 0.7
+SEARCH_TYPO_FACTOR = 0.4
+SEARCH_TYPO_MIN_LENGTH = 4
+# Terms this short expand to a large part of the vocabulary, so their matches are computed
+# once per catalog version and reused until the index changes
+SEARCH_SHORT_TERM_LENGTH = 2
+
+# Query and phase instrumentation - latencies go into fixed histogram buckets (upper bounds
+# in milliseconds) and the most recent records are kept for the debug panel
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, float("inf")]
+METRICS_MAX_LABELS = 50
+METRICS_RECENT_RECORDS = 200
+
+# Roles allowed to export the latency metrics as JSON
+METRICS_EXPORT_ROLES = {"ACCOUNTADMIN", "SYSADMIN"}
+
+# Persistent catalog snapshots (Parquet, one per account, role and catalog source). After a
+# restart the last snapshot is served immediately while a fresh catalog loads in the
+# background. The local directory is only a working copy: snapshots are kept on the app's
+# stage (created by deploy_to_snowflake.sql) so they survive container restarts. Point the
+# stage elsewhere if the app is deployed differently; None keeps snapshots local only.
+CATALOG_SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), "landing_page_snapshots")
+CATALOG_SNAPSHOT_STAGE = "@app_stage/catalog_snapshots"
+SNAPSHOT_REFRESH_POLL_SECONDS = 2
+
+# Background refresher - catalogs that pages read recently are re-fetched on a schedule,
+# well inside the cache TTL, so a rerun never blocks on an expired entry. A new snapshot is
+# only published when the content hash of the rows changes. Catalogs are refreshed once per
+# role, however many users share it, and roles nobody has read for the idle period are
+# dropped from the schedule so an unused app lets the warehouse suspend.
+CATALOG_REFRESH_INTERVAL_SECONDS = 120
+CATALOG_REFRESH_IDLE_SECONDS = 600
+
+# Entitlements - which apps the current role (including inherited roles and PUBLIC) holds
+# USAGE or OWNERSHIP on. Resolved for the whole catalog in one ACCOUNT_USAGE query, falling
+# back to one SHOW GRANTS per role in the hierarchy, and cached per role. The catalog query
+# already lists only apps the role can see, so grants only annotate ACCESS_STATUS: an app
+# without a grant found here (a grant newer than the ACCOUNT_USAGE lag, or one made through
+# a database role) is marked 'Check Access', never removed.
+ENTITLEMENT_CACHE_TTL_SECONDS = 600
+ENTITLEMENT_CACHE_MAX_ENTRIES = 256
+MAX_ROLE_HIERARCHY_LOOKUPS = 25
+ENTITLEMENTS_QUERY = """
+WITH RECURSIVE role_tree (role_name) AS (
+    SELECT role_name FROM (SELECT CAST(? AS VARCHAR) AS role_name UNION SELECT 'PUBLIC')
+    UNION ALL
+    SELECT g.name
+    FROM SNOWFLAKE.ACCOUNT_USAGE.GRANTS_TO_ROLES g
+    JOIN role_tree r ON g.grantee_name = r.role_name
+    WHERE g.granted_on = 'ROLE' AND g.privilege = 'USAGE' AND g.deleted_on IS NULL
+)
+SELECT DISTINCT g.table_catalog AS database_name, g.table_schema AS schema_name, g.name AS app_name, g.privilege AS privilege
+FROM SNOWFLAKE.ACCOUNT_USAGE.GRANTS_TO_ROLES g
+JOIN role_tree r ON g.grantee_name = r.role_name
+WHERE g.granted_on = 'STREAMLIT' AND g.privilege IN ('USAGE', 'OWNERSHIP') AND g.deleted_on IS NULL
+"""
+
+# Usage events - app launches are buffered in memory and written with multi-row
+# INSERTs once EVENT_FLUSH_MAX_EVENTS are buffered or every EVENT_FLUSH_INTERVAL_SECONDS,
+# never one INSERT per click. The table is created in the app's schema on the first flush.
+# A launch is recorded when the user picks an app (its card's Launch button or its table
+# row); the app itself then opens from a real link, so pop-up blockers never get involved.
+EVENTS_TABLE = "LANDING_PAGE_EVENTS"
+EVENT_COLUMNS = {
+    "EVENT_TIME": "TIMESTAMP_NTZ",
+    "EVENT_TYPE": "VARCHAR",
+    "USERNAME": "VARCHAR",
+    "ROLE_NAME": "VARCHAR",
+    "DATABASE_NAME": "VARCHAR",
+    "SCHEMA_NAME": "VARCHAR",
+    "APP_NAME": "VARCHAR"
+}
+EVENT_FLUSH_MAX_EVENTS = 200
+EVENT_FLUSH_INTERVAL_SECONDS = 30
+EVENT_INSERT_BATCH_ROWS = 500
+EVENT_BUFFER_MAX_EVENTS = 10000
+
+# Popularity ranking - apps are ordered per role by launches over the last
+# POPULARITY_WINDOW_DAYS. Apps merely shown on a page are not counted, so the ranking
+# cannot keep whatever is on the first page on top. Rankings are computed in the
+# background and cached, so ordering the catalog never waits on the events query.
+POPULARITY_WINDOW_DAYS = 30
+POPULARITY_CACHE_TTL_SECONDS = 600
+POPULARITY_CACHE_MAX_ENTRIES = 256
+POPULARITY_QUERY = """
+SELECT database_name, schema_name, app_name, COUNT(*) AS launches
+FROM {table}
+WHERE role_name = ? AND event_type = 'launch' AND event_time >= ?
+GROUP BY database_name, schema_name, app_name
+"""
+
+# Role names get_current_user_info falls back to when the session context cannot be
+# read; they are not real roles, so their grants are never looked up
+PLACEHOLDER_ROLES = frozenset({"Current Role", "Unknown Role"})
+
+# Fully qualified (DATABASE.SCHEMA.NAME, upper-case) apps a role can use and owns.
+# None means the grants could not be read, in which case the catalog is not filtered.
+AppEntitlements = namedtuple("AppEntitlements", ["usable", "owned"])
+UNRESOLVED_ENTITLEMENTS = AppEntitlements(None, None)
+
+# A catalog as served to the page: the apps, when they were last checked against Snowflake,
+# whether they came from a snapshot that is still being revalidated, and a hash of the rows
+CatalogSnapshot = namedtuple("CatalogSnapshot", ["apps_df", "refreshed_at", "stale", "content_hash"], defaults=(None,))
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[0] > self.ttl_seconds:
+                # Expired entries stay (bounded by max_entries) so get_stale can still serve them
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def replace(self, key, value):
+        """Replace the value of an existing entry without renewing its time-to-live"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], value)
+
+    def get_stale(self, key):
+        """Return the cached value for key even if it has expired, without counting a lookup"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry[1]
+
+    def has_fresh_entries(self):
+        """True if at least one entry has not expired yet"""
+        now = time.monotonic()
+        with self._lock:
+            return any(now - stored_at <= self.ttl_seconds for stored_at, _ in self._entries.values())
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Drop a single entry, or every entry when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Return hit/miss counters for display"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+@st.cache_resource
+def get_catalog_cache():
+    """Process-wide catalog cache shared by all sessions"""
+    return TTLCache(CATALOG_CACHE_TTL_SECONDS, CATALOG_CACHE_MAX_ENTRIES)
+
+class CatalogStrategyTracker:
+    """
+    Remembers which catalog strategy works for each role, keeps per-strategy latency
+    and failure counts, and opens a circuit breaker on strategies that keep failing
+    """
+
+    def __init__(self, failure_threshold, cooldown_seconds):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._remembered = {}
+        self._stats = {
+            name: {
+                "calls": 0,
+                "failures": 0,
+                "consecutive_failures": 0,
+                "total_seconds": 0.0,
+                "last_seconds": None,
+                "last_error": None,
+                "open_until": 0.0
+            }
+            for name in CATALOG_STRATEGIES
+        }
+
+    def remembered(self, role):
+        with self._lock:
+            return self._remembered.get(role)
+
+    def remember(self, role, name):
+        with self._lock:
+            self._remembered[role] = name
+            # Also remembered as the process-wide default for loads that start before the role is known
+            self._remembered[None] = name
+
+    def forget(self, role):
+        with self._lock:
+            self._remembered.pop(role, None)
+
+    def is_available(self, name):
+        """A strategy is skipped while its circuit is open; after the cooldown it gets another try"""
+        with self._lock:
+            return time.monotonic() >= self._stats[name]["open_until"]
+
+    def record_success(self, name, elapsed):
+        with self._lock:
+            stats = self._stats[name]
+            stats["calls"] += 1
+            stats["total_seconds"] += elapsed
+            stats["last_seconds"] = elapsed
+            stats["consecutive_failures"] = 0
+            stats["open_until"] = 0.0
+
+    def record_failure(self, name, elapsed, error):
+        with self._lock:
+            stats = self._stats[name]
+            stats["calls"] += 1
+            stats["failures"] += 1
+            stats["consecutive_failures"] += 1
+            stats["total_seconds"] += elapsed
+            stats["last_seconds"] = elapsed
+            stats["last_error"] = str(error)
+            if stats["consecutive_failures"] >= self.failure_threshold:
+                stats["open_until"] = time.monotonic() + self.cooldown_seconds
+
+    def stats(self):
+        """Return per-strategy latency and failure counts for display"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "strategy": name,
+                    "calls": stats["calls"],
+                    "failures": stats["failures"],
+                    "avg_ms": round(1000 * stats["total_seconds"] / stats["calls"], 1) if stats["calls"] else None,
+                    "last_ms": round(1000 * stats["last_seconds"], 1) if stats["last_seconds"] is not None else None,
+                    "circuit": "open" if now < stats["open_until"] else "closed",
+                    "last_error": stats["last_error"]
+                }
+                for name, stats in self._stats.items()
+            ]
+
+@st.cache_resource
+def get_catalog_strategy_tracker():
+    """Process-wide strategy tracker shared by all sessions"""
+    return CatalogStrategyTracker(CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN_SECONDS)
+
+@st.cache_resource
+def get_catalog_probe_executor():
+    """Small thread pool used to probe catalog strategies concurrently"""
+    return ThreadPoolExecutor(max_workers=CATALOG_PROBE_WORKERS, thread_name_prefix="catalog-probe")
+
+@st.cache_resource
+def get_entitlement_cache():
+    """Process-wide role -> AppEntitlements cache"""
+    return TTLCache(ENTITLEMENT_CACHE_TTL_SECONDS, ENTITLEMENT_CACHE_MAX_ENTRIES)
+
+@st.cache_resource
+def get_background_executor():
+    """Thread pool for snapshot revalidation and snapshot writes"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="catalog-refresh")
+
+@st.cache_resource
+def get_background_refreshes():
+    """Latest background refresh future per catalog cache key (and per popularity ranking), least recently started evicted first"""
+    return TTLCache(CATALOG_CACHE_TTL_SECONDS, CATALOG_CACHE_MAX_ENTRIES)
+
+@st.cache_resource
+def get_bootstrap_executor():
+    """
+    Thread pool for catalog loads started before the user context is known. Kept
+    separate from the probe pool so a waiting load never blocks its own probes.
+    """
+    return ThreadPoolExecutor(max_workers=CATALOG_PROBE_WORKERS, thread_name_prefix="page-bootstrap")
+
+class LatencyMetrics:
+    """
+    Per-process latency histograms for warehouse queries and page phases. Memory is
+    bounded: each label has a fixed set of buckets, the number of labels is capped and
+    only the most recent records are kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._recent = deque(maxlen=METRICS_RECENT_RECORDS)
+
+    def record(self, label, elapsed, rows=None, nbytes=None, query=None):
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            if label not in self._histograms and len(self._histograms) >= METRICS_MAX_LABELS:
+                label = "other"
+            histogram = self._histograms.get(label)
+            if histogram is None:
+                histogram = self._histograms[label] = {
+                    "buckets": [0] * len(LATENCY_BUCKETS_MS),
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "bytes": 0
+                }
+            histogram["buckets"][bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            histogram["count"] += 1
+            histogram["total_ms"] += elapsed_ms
+            histogram["max_ms"] = max(histogram["max_ms"], elapsed_ms)
+            histogram["rows"] += rows or 0
+            histogram["bytes"] += nbytes or 0
+            self._recent.append({
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "label": label,
+                "query": query,
+                "elapsed_ms": round(elapsed_ms, 1),
+                "rows": rows,
+                "bytes": nbytes
+            })
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of page work, e.g. mapping or rendering"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(f"phase: {name}", time.perf_counter() - start)
+
+    @staticmethod
+    def _percentile(buckets, count, fraction):
+        """Upper bucket bound containing the given fraction of samples"""
+        threshold = fraction * count
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS_MS, buckets):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                return bound
+        return LATENCY_BUCKETS_MS[-1]
+
+    def summary(self):
+        """Return one row per label with counts, mean/max and bucketed percentiles"""
+        with self._lock:
+            return [
+                {
+                    "label": label,
+                    "count": histogram["count"],
+                    "mean_ms": round(histogram["total_ms"] / histogram["count"], 1),
+                    "p50_ms": self._percentile(histogram["buckets"], histogram["count"], 0.50),
+                    "p90_ms": self._percentile(histogram["buckets"], histogram["count"], 0.90),
+                    "p99_ms": self._percentile(histogram["buckets"], histogram["count"], 0.99),
+                    "max_ms": round(histogram["max_ms"], 1),
+                    "rows": histogram["rows"],
+                    "bytes": histogram["bytes"]
+                }
+                for label, histogram in self._histograms.items()
+            ]
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
+
+    def export_json(self):
+        """Serialize histograms and recent records for offline analysis"""
+        with self._lock:
+            histograms = {
+                label: dict(histogram, bucket_bounds_ms=[str(bound) for bound in LATENCY_BUCKETS_MS])
+                for label, histogram in self._histograms.items()
+            }
+            recent = list(self._recent)
+        return json.dumps({
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "histograms": histograms,
+            "recent": recent
+        }, indent=2, default=str)
 
-# Initialize Snowflake session
 @st.cache_resource
-def init_connection():
-    """Initialize connection to Snowflake"""
-    return get_active_session()
+def get_latency_metrics():
+    """Process-wide latency metrics shared by all sessions"""
+    return LatencyMetrics()
+
+def query_label(query):
+    """Short, stable histogram label for a query"""
+    return "sql: " + " ".join(query.split())[:60]
+
+def estimate_result_bytes(result):
+    """Approximate in-memory size of a collect() or to_pandas() result"""
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=False, deep=True).sum())
+    return sum(sys.getsizeof(value) for row in result for value in row)
+
+class InstrumentedAsyncJob:
+    """Wraps an async query job so the time until its result is available gets recorded"""
+
+    def __init__(self, job, metrics, query, start):
+        self._job = job
+        self._metrics = metrics
+        self._query = query
+        self._start = start
+
+    def result(self):
+        result = self._job.result()
+        self._metrics.record(query_label(self._query), time.perf_counter() - self._start,
+                             rows=len(result), nbytes=estimate_result_bytes(result), query=self._query)
+        return result
+
+class InstrumentedQuery:
+    """Wraps a Snowpark DataFrame and records text, elapsed time, row count and bytes of each execution"""
+
+    def __init__(self, dataframe, metrics, query):
+        self._dataframe = dataframe
+        self._metrics = metrics
+        self._query = query
+
+    def _timed(self, fetch):
+        start = time.perf_counter()
+        result = fetch()
+        self._metrics.record(query_label(self._query), time.perf_counter() - start,
+                             rows=len(result), nbytes=estimate_result_bytes(result), query=self._query)
+        return result
+
+    def collect(self):
+        return self._timed(self._dataframe.collect)
 
-def get_current_user_info(session):
-    """Get current user information with robust error handling"""
+    def to_pandas(self):
+        return self._timed(self._dataframe.to_pandas)
+
+    def collect_nowait(self):
+        return InstrumentedAsyncJob(self._dataframe.collect_nowait(), self._metrics, self._query, time.perf_counter())
+
+    @property
+    def schema(self):
+        start = time.perf_counter()
+        schema = self._dataframe.schema
+        self._metrics.record("describe: " + query_label(self._query)[5:], time.perf_counter() - start, query=self._query)
+        return schema
+
+class InstrumentedSession:
+    """Thin wrapper around a Snowpark session that instruments every session.sql call"""
+
+    def __init__(self, session, metrics):
+        self._session = session
+        self.metrics = metrics
+
+    def sql(self, query, *args, **kwargs):
+        return InstrumentedQuery(self._session.sql(query, *args, **kwargs), self.metrics, query)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+def record_phase(session, name, elapsed):
+    """Record a phase timing when the session is instrumented (plain sessions are skipped)"""
+    if isinstance(session, InstrumentedSession):
+        session.metrics.record(f"phase: {name}", elapsed)
+
+def get_current_user_info(session, user_job=None):
+    """
+    Get current user information with robust error handling. When user_job is given
+    it is an already submitted async job for USER_CONTEXT_QUERY.
+    """
     try:
         # Try to get user info with context functions
-        user_query = "SELECT CURRENT_USER() as username, CURRENT_ROLE() as current_role"
-        result = session.sql(user_query).collect()
+        if user_job is not None:
+            result = user_job.result()
+        else:
+            result = session.sql(USER_CONTEXT_QUERY).collect()
         
         if result and len(result) > 0:
             user_data = result[0].asDict()
             # Handle case sensitivity issues - Snowflake might return uppercase column names
             username = user_data.get('username') or user_data.get('USERNAME') or user_data.get('CURRENT_USER()') or 'Unknown User'
             current_role = user_data.get('current_role') or user_data.get('CURRENT_ROLE') or user_data.get('CURRENT_ROLE()') or 'Unknown Role'
+            account = user_data.get('account') or user_data.get('ACCOUNT') or user_data.get('CURRENT_ACCOUNT()') or 'Unknown Account'
             
             return {
                 "username": str(username),
-                "current_role": str(current_role)
+                "current_role": str(current_role),
+                "account": str(account)
             }
         else:
-            return {"username": "Unknown User", "current_role": "Unknown Role"}
+            return {"username": "Unknown User", "current_role": "Unknown Role", "account": "Unknown Account"}
             
     except Exception as e:
         # Context functions might not work without proper privileges
@@ -50,71 +579,821 @@ def get_current_user_info(session):
         # Return generic info when context functions don't work
         return {
             "username": "Streamlit User", 
-            "current_role": "Current Role"
+            "current_role": "Current Role",
+            "account": "Unknown Account"
         }
 
-def get_user_streamlit_apps(session):
+# Candidate source columns for each standard catalog field, in order of preference.
+# The catalog views and SHOW STREAMLITS spell these differently, so the first
+# candidate with a non-empty value wins (column names are matched case-insensitively).
+CATALOG_FIELD_CANDIDATES = {
+    'APP_NAME': ['TITLE', 'STREAMLIT_TITLE', 'APP_TITLE', 'NAME', 'APP_NAME', 'STREAMLIT_NAME'],
+    'INTERNAL_NAME': ['STREAMLIT_NAME', 'NAME', 'APP_NAME'],
+    'APP_URL': ['STREAMLIT_URL_ID', 'STREAMLIT_URL', 'URL_ID', 'APP_URL_ID', 'URL', 'APP_URL'],
+    'CREATED_ON': ['CREATED_ON', 'CREATED'],
+    'OWNER': ['STREAMLIT_OWNER', 'OWNER', 'CREATED_BY'],
+    'DESCRIPTION': ['COMMENT', 'DESCRIPTION'],
+    'DATABASE_NAME': ['STREAMLIT_CATALOG', 'DATABASE_NAME', 'DB'],
+    'SCHEMA_NAME': ['STREAMLIT_SCHEMA', 'SCHEMA_NAME', 'SCHEMA']
+}
+
+# Values used when none of the candidate columns has a value
+CATALOG_FIELD_DEFAULTS = {
+    'APP_NAME': 'Unknown',
+    'INTERNAL_NAME': 'Unknown',
+    'APP_URL': '',
+    'CREATED_ON': '',
+    'OWNER': 'Unknown',
+    'DESCRIPTION': 'No description available',
+    'DATABASE_NAME': '',
+    'SCHEMA_NAME': ''
+}
+
+@st.cache_resource
+def get_catalog_schema_cache():
+    """Resolved column mappings keyed by (query, result columns), and projected queries keyed by strategy"""
+    return {}
+
+def resolve_catalog_schema(columns):
+    """
+    Build a fixed mapping from each standard catalog field to the source columns
+    that can provide it, in order of preference
+    """
+    columns_by_name = {}
+    for column in columns:
+        name = str(column).strip('"')
+        # Prefer the upper-case spelling when both spellings are present
+        if name.upper() not in columns_by_name or name.isupper():
+            columns_by_name[name.upper()] = column
+    
+    return {
+        field: tuple(columns_by_name[candidate] for candidate in candidates if candidate in columns_by_name)
+        for field, candidates in CATALOG_FIELD_CANDIDATES.items()
+    }
+
+def get_catalog_mapping(schema_cache, query, columns):
+    """Return the resolved column mapping for a query, inspecting the schema only once"""
+    cache_key = (query, tuple(columns))
+    mapping = schema_cache.get(cache_key)
+    if mapping is None:
+        mapping = resolve_catalog_schema(columns)
+        schema_cache[cache_key] = mapping
+    return mapping
+
+def normalize_catalog_frame(raw_df, mapping):
+    """Map a raw catalog result to the standard format in one projection over the whole frame"""
+    source_columns = list(dict.fromkeys(column for sources in mapping.values() for column in sources))
+    
+    # Project the needed columns once and treat empty strings like missing values
+    projected = raw_df[source_columns]
+    projected = projected.mask(projected.eq(''))
+    
+    apps_df = pd.DataFrame(index=raw_df.index)
+    for field, sources in mapping.items():
+        default = CATALOG_FIELD_DEFAULTS[field]
+        if not sources:
+            apps_df[field] = default
+            continue
+        
+        # Coalesce the candidates left to right, one column at a time
+        values = projected[sources[0]]
+        for fallback in sources[1:]:
+            values = values.fillna(projected[fallback])
+        values = values.fillna(default)
+        if values.hasnans:
+            # fillna leaves NaT in a datetime column (e.g. CREATED_ON) when the default is a string
+            values = values.astype(object).where(values.notna(), default)
+        apps_df[field] = values
+    
+    apps_df['ACCESS_STATUS'] = 'Available'
+    apps_df['ACCESS_LEVEL'] = 'USAGE'
+    return apps_df.reset_index(drop=True)
+
+def quote_identifier(name):
+    """Double-quote a column name unless Snowpark already returned it quoted"""
+    return name if name.startswith('"') else f'"{name}"'
+
+def build_projected_query(query, mapping):
+    """
+    Rewrite a SELECT * catalog query to fetch only the columns the landing page uses.
+    Columns are aliased to their upper-case names so the fetched frame resolves cleanly.
+    """
+    source_columns = list(dict.fromkeys(column for sources in mapping.values() for column in sources))
+    if not source_columns:
+        return query
+    
+    select_items = []
+    for column in source_columns:
+        alias = quote_identifier(column.strip('"').upper())
+        select_items.append(f"{quote_identifier(column)} AS {alias}")
+    select_list = ", ".join(select_items)
+    return query.replace("SELECT *", f"SELECT {select_list}", 1)
+
+def get_projected_query(session, name, schema_cache):
+    """
+    Return the column-projected query for a strategy, describing the view once to
+    find its columns. SHOW commands cannot be projected and are returned as is.
+    """
+    query = CATALOG_STRATEGIES[name]
+    if not query.startswith("SELECT * FROM"):
+        return query
+    
+    projected_query = schema_cache.get(("projection", name))
+    if projected_query is None:
+        # Describing the query returns its schema without fetching any rows
+        columns = session.sql(query).schema.names
+        mapping = get_catalog_mapping(schema_cache, query, columns)
+        projected_query = build_projected_query(query, mapping)
+        schema_cache[("projection", name)] = projected_query
+    return projected_query
+
+def run_catalog_strategy(session, name, tracker, schema_cache):
+    """
+    Run a single catalog strategy and return the normalized apps, or None if the
+    query failed. Outcomes are recorded on the tracker.
+    """
+    start = time.perf_counter()
+    try:
+        query = get_projected_query(session, name, schema_cache)
+        # Fetched as Arrow batches straight into pandas, without Row objects
+        raw_df = session.sql(query).to_pandas()
+        apps_df = pd.DataFrame()
+        if not raw_df.empty:
+            mapping_start = time.perf_counter()
+            mapping = get_catalog_mapping(schema_cache, query, list(raw_df.columns))
+            apps_df = normalize_catalog_frame(raw_df, mapping)
+            record_phase(session, "mapping", time.perf_counter() - mapping_start)
+    except Exception as e:
+        # The view may have changed shape, so describe it again next time
+        schema_cache.pop(("projection", name), None)
+        tracker.record_failure(name, time.perf_counter() - start, e)
+        return None
+    
+    tracker.record_success(name, time.perf_counter() - start)
+    return apps_df
+
+def get_user_streamlit_apps(session, role=None):
     """
     Get list of Streamlit applications that the current user has access to
     This queries Snowflake's system tables to find accessible Streamlit apps
     """
+    return fetch_streamlit_apps(
+        session, role, get_catalog_strategy_tracker(), get_catalog_schema_cache(), get_catalog_probe_executor()
+    )
+
+def fetch_streamlit_apps(session, role, tracker, schema_cache, executor):
+    """
+    Load the app catalog using the remembered strategy for role, or by probing all
+    strategies concurrently. Takes its shared state explicitly so it can run on a
+    worker thread. Returns an empty frame when the strategies that ran found no apps,
+    and None only when every strategy failed.
+    """
+    # Reuse the strategy that worked last time for this role
+    remembered = tracker.remembered(role)
+    if remembered and tracker.is_available(remembered):
+        apps_df = run_catalog_strategy(session, remembered, tracker, schema_cache)
+        if apps_df is not None and not apps_df.empty:
+            return apps_df
+        tracker.forget(role)
     
-    def map_row_to_standard_format(row_dict):
-        """Helper function to map row data to standard format"""
-        return {
-            'APP_NAME': (row_dict.get('TITLE') or row_dict.get('title') or 
-                       row_dict.get('STREAMLIT_TITLE') or row_dict.get('streamlit_title') or
-                       row_dict.get('APP_TITLE') or row_dict.get('app_title') or 
-                       row_dict.get('NAME') or row_dict.get('name') or 
-                       row_dict.get('APP_NAME') or row_dict.get('app_name') or 
-                       row_dict.get('STREAMLIT_NAME') or row_dict.get('streamlit_name') or 'Unknown'),
-            'INTERNAL_NAME': (row_dict.get('STREAMLIT_NAME') or row_dict.get('streamlit_name') or 
-                            row_dict.get('NAME') or row_dict.get('name') or
-                            row_dict.get('APP_NAME') or row_dict.get('app_name') or 'Unknown'),
-            'APP_URL': (row_dict.get('STREAMLIT_URL_ID') or row_dict.get('streamlit_url_id') or
-                      row_dict.get('STREAMLIT_URL') or row_dict.get('streamlit_url') or
-                      row_dict.get('URL_ID') or row_dict.get('url_id') or 
-                      row_dict.get('APP_URL_ID') or row_dict.get('app_url_id') or
-                      row_dict.get('URL') or row_dict.get('url') or 
-                      row_dict.get('APP_URL') or row_dict.get('app_url') or ''),
-            'CREATED_ON': (row_dict.get('CREATED_ON') or row_dict.get('created_on') or 
-                         row_dict.get('CREATED') or ''),
-            'OWNER': (row_dict.get('STREAMLIT_OWNER') or row_dict.get('streamlit_owner') or 
-                    row_dict.get('OWNER') or row_dict.get('owner') or 
-                    row_dict.get('CREATED_BY') or row_dict.get('created_by') or 'Unknown'),
-            'DESCRIPTION': (row_dict.get('COMMENT') or row_dict.get('comment') or 
-                          row_dict.get('DESCRIPTION') or 'No description available'),
-            'DATABASE_NAME': (row_dict.get('STREAMLIT_CATALOG') or row_dict.get('streamlit_catalog') or
-                            row_dict.get('DATABASE_NAME') or row_dict.get('database_name') or 
-                            row_dict.get('DB') or ''),
-            'SCHEMA_NAME': (row_dict.get('STREAMLIT_SCHEMA') or row_dict.get('streamlit_schema') or
-                          row_dict.get('SCHEMA_NAME') or row_dict.get('schema_name') or 
-                          row_dict.get('SCHEMA') or ''),
-            'ACCESS_STATUS': 'Available',
-            'ACCESS_LEVEL': 'USAGE'
-        }
+    # Cold start: probe every strategy whose circuit is closed, first usable result wins
+    futures = {
+        executor.submit(run_catalog_strategy, session, name, tracker, schema_cache): name
+        for name in CATALOG_STRATEGIES
+        if tracker.is_available(name)
+    }
+    empty = None
+    for future in as_completed(futures):
+        apps_df = future.result()
+        if apps_df is None:
+            continue
+        if not apps_df.empty:
+            tracker.remember(role, futures[future])
+            return apps_df
+        empty = apps_df
+    
+    # The role really has no apps if a strategy succeeded; None if every strategy failed
+    return empty
+
+def qualified_app_name(*parts):
+    """Normalize DATABASE.SCHEMA.NAME for matching grants against the catalog"""
+    return ".".join(str(part) for part in parts).replace('"', '').upper()
+
+def load_entitlements_from_account_usage(session, role):
+    """One query over ACCOUNT_USAGE.GRANTS_TO_ROLES covering the whole role hierarchy"""
+    rows = session.sql(ENTITLEMENTS_QUERY, params=[role]).collect()
+    usable = set()
+    owned = set()
+    for row in rows:
+        grant = {key.upper(): value for key, value in row.asDict().items()}
+        name = qualified_app_name(grant['DATABASE_NAME'], grant['SCHEMA_NAME'], grant['APP_NAME'])
+        usable.add(name)
+        if grant['PRIVILEGE'] == 'OWNERSHIP':
+            owned.add(name)
+    return AppEntitlements(frozenset(usable), frozenset(owned))
+
+def load_entitlements_from_show_grants(session, role):
+    """
+    Walk the role hierarchy with one SHOW GRANTS per role (not per app). A hierarchy
+    larger than MAX_ROLE_HIERARCHY_LOOKUPS returns UNRESOLVED_ENTITLEMENTS rather than
+    the grants of the roles walked so far.
+    """
+    usable = set()
+    owned = set()
+    pending = ['PUBLIC', role]
+    seen = set()
+    while pending and len(seen) < MAX_ROLE_HIERARCHY_LOOKUPS:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        quoted_role = '"' + current.replace('"', '""') + '"'
+        for row in session.sql(f"SHOW GRANTS TO ROLE {quoted_role}").collect():
+            grant = {key.lower(): value for key, value in row.asDict().items()}
+            granted_on = str(grant.get('granted_on', '')).upper()
+            privilege = str(grant.get('privilege', '')).upper()
+            if granted_on == 'ROLE' and privilege == 'USAGE':
+                pending.append(str(grant['name']))
+            elif granted_on == 'STREAMLIT' and privilege in ('USAGE', 'OWNERSHIP'):
+                name = qualified_app_name(grant['name'])
+                usable.add(name)
+                if privilege == 'OWNERSHIP':
+                    owned.add(name)
+    
+    if any(pending_role not in seen for pending_role in pending):
+        # The walk was cut off; a partial grant set would hide apps inherited further up
+        return UNRESOLVED_ENTITLEMENTS
+    return AppEntitlements(frozenset(usable), frozenset(owned))
+
+def resolve_role_entitlements(session, role, entitlement_cache):
+    """
+    Return the cached AppEntitlements for a role, resolving them with batched grant lookups.
+    An empty grant set is not trusted (ACCOUNT_USAGE lags by up to two hours, and a failed
+    role lookup sees no grants), so it resolves to UNRESOLVED_ENTITLEMENTS, not deny-all.
+    """
+    if role in PLACEHOLDER_ROLES:
+        return UNRESOLVED_ENTITLEMENTS
     
-    # Try multiple approaches silently
-    approaches = [
-        "SELECT * FROM SNOWFLAKE.INFORMATION_SCHEMA.STREAMLITS",
-        "SELECT * FROM INFORMATION_SCHEMA.STREAMLITS", 
-        "SHOW STREAMLITS"
-    ]
+    entitlements = entitlement_cache.get(role)
+    if entitlements is not None:
+        return entitlements
     
-    for query in approaches:
+    entitlements = UNRESOLVED_ENTITLEMENTS
+    for loader in (load_entitlements_from_account_usage, load_entitlements_from_show_grants):
         try:
-            result = session.sql(query).collect()
-            if result:
-                apps_data = []
-                for row in result:
-                    row_dict = row.asDict()
-                    apps_data.append(map_row_to_standard_format(row_dict))
-                return pd.DataFrame(apps_data)
-        except:
+            loaded = loader(session, role)
+        except Exception:
             continue
+        if loaded.usable or loaded.owned:
+            entitlements = loaded
+            break
     
-    # If no real apps found, return empty DataFrame
-    return pd.DataFrame()
+    # Failures are cached too, so an unreadable grant view is not retried on every load
+    entitlement_cache.set(role, entitlements)
+    return entitlements
+
+def catalog_app_names(apps_df):
+    """qualified_app_name() of every app in a catalog frame, built for the whole frame at once"""
+    return (
+        apps_df['DATABASE_NAME'].astype(str) + "." + apps_df['SCHEMA_NAME'].astype(str) + "." + apps_df['INTERNAL_NAME'].astype(str)
+    ).str.replace('"', '', regex=False).str.upper()
+
+def apply_entitlements(apps_df, entitlements):
+    """
+    Set ACCESS_STATUS / ACCESS_LEVEL from the real grants. Apps with no grant found are
+    kept and marked 'Check Access': the catalog query only lists apps the role can see,
+    and grant lookups miss recent grants and grants made through database roles.
+    """
+    if entitlements.usable is None or apps_df.empty or 'INTERNAL_NAME' not in apps_df.columns:
+        return apps_df
+    
+    names = catalog_app_names(apps_df)
+    owned = names.isin(entitlements.owned)
+    usable = names.isin(entitlements.usable)
+    
+    apps_df = apps_df.copy()
+    apps_df['ACCESS_STATUS'] = np.select([owned, usable], ['Owner', 'Accessible'], 'Check Access')
+    apps_df['ACCESS_LEVEL'] = np.select([owned, usable], ['OWNERSHIP', 'USAGE'], 'UNKNOWN')
+    return apps_df
+
+def catalog_source_id():
+    """
+    Short fingerprint of where the catalog comes from (the strategy queries and app URL),
+    so a snapshot written by a differently configured app is never served
+    """
+    source = "\n".join([STREAMLIT_BASE_URL, *CATALOG_STRATEGIES.values()])
+    return hashlib.sha1(source.encode()).hexdigest()[:12]
+
+def catalog_cache_key(user_info):
+    """
+    Catalog cache key for a user: (account, role). The catalog depends only on these,
+    so every user on a role shares one cache entry and one scheduled refresh.
+    """
+    return (user_info.get('account', 'Unknown Account'), user_info['current_role'])
+
+def snapshot_path(cache_key):
+    """Local Parquet path of the catalog snapshot for a catalog cache key"""
+    account, role = cache_key
+    name = re.sub(r'[^A-Za-z0-9_]+', '_', f"{account}_{role}_{catalog_source_id()}")
+    return os.path.join(CATALOG_SNAPSHOT_DIR, f"catalog_{name}.parquet")
+
+def catalog_strings(apps_df):
+    """The catalog with every value as a string and missing values as '' (not 'None', 'NaT' or 'nan')"""
+    return apps_df.astype(object).where(apps_df.notna(), '').astype(str)
+
+def save_catalog_snapshot(session, cache_key, snapshot):
+    """Write a catalog snapshot as Parquet, and copy it to the snapshot stage when configured"""
+    path = snapshot_path(cache_key)
+    os.makedirs(CATALOG_SNAPSHOT_DIR, exist_ok=True)
+    
+    table = pa.Table.from_pandas(catalog_strings(snapshot.apps_df), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"refreshed_at"] = snapshot.refreshed_at.isoformat().encode()
+    if snapshot.content_hash:
+        metadata[b"content_hash"] = snapshot.content_hash.encode()
+    
+    # Write to a temporary file first so readers never see a partial snapshot
+    pq.write_table(table.replace_schema_metadata(metadata), path + ".tmp")
+    os.replace(path + ".tmp", path)
+    
+    if CATALOG_SNAPSHOT_STAGE:
+        with leased_session(session) as stage_session:
+            stage_session.file.put(path, CATALOG_SNAPSHOT_STAGE, auto_compress=False, overwrite=True)
+
+def load_catalog_snapshot(session, cache_key):
+    """Load the last catalog snapshot for a catalog cache key (marked stale), or None if there is none"""
+    path = snapshot_path(cache_key)
+    try:
+        if not os.path.exists(path) and CATALOG_SNAPSHOT_STAGE:
+            os.makedirs(CATALOG_SNAPSHOT_DIR, exist_ok=True)
+            with leased_session(session) as stage_session:
+                stage_session.file.get(f"{CATALOG_SNAPSHOT_STAGE}/{os.path.basename(path)}", CATALOG_SNAPSHOT_DIR)
+        if not os.path.exists(path):
+            return None
+        
+        table = pq.read_table(path)
+        metadata = table.schema.metadata
+        refreshed_at = datetime.fromisoformat(metadata[b"refreshed_at"].decode())
+        content_hash = metadata[b"content_hash"].decode() if b"content_hash" in metadata else None
+        return CatalogSnapshot(table.to_pandas(), refreshed_at, True, content_hash)
+    except Exception:
+        # A missing or unreadable snapshot just means a normal, blocking load
+        return None
+
+def save_catalog_snapshot_quietly(session, cache_key, snapshot):
+    """Background-safe snapshot write; a failed write only costs the next cold start"""
+    try:
+        save_catalog_snapshot(session, cache_key, snapshot)
+    except Exception:
+        pass
+
+def catalog_content_hash(apps_df):
+    """
+    Order-independent hash of the catalog rows. Values are compared as strings, so a
+    snapshot read back from Parquet hashes the same as the catalog it was written from.
+    """
+    row_hashes = pd.util.hash_pandas_object(catalog_strings(apps_df), index=False).to_numpy()
+    digest = hashlib.sha1("\x1f".join(map(str, apps_df.columns)).encode())
+    digest.update(np.sort(row_hashes).tobytes())
+    return digest.hexdigest()
+
+def publish_catalog(cache, cache_key, apps_df):
+    """
+    Publish a freshly loaded catalog to the catalog cache. When its content hash matches
+    the current snapshot, the current apps_df object is kept (so search indexes and other
+    per-snapshot caches are not rebuilt) and only the refresh time is updated.
+    Returns (snapshot, changed).
+    """
+    content_hash = catalog_content_hash(apps_df)
+    current = cache.get_stale(cache_key)
+    changed = current is None or current.content_hash != content_hash
+    if not changed:
+        apps_df = current.apps_df
+    snapshot = CatalogSnapshot(apps_df, datetime.now(), False, content_hash)
+    cache.set(cache_key, snapshot)
+    return snapshot, changed
+
+def start_background_refresh(session, role, cache_key, stale_snapshot, prefetched=None):
+    """
+    Revalidate a stale snapshot in the background: load the catalog (or wait for an
+    already started load), publish it to the catalog cache and persist it. Only one
+    refresh per cache key runs at a time.
+    """
+    refreshes = get_background_refreshes()
+    running = refreshes.get_stale(cache_key)
+    if running is not None and not running.done():
+        return running
+    
+    cache = get_catalog_cache()
+    tracker = get_catalog_strategy_tracker()
+    schema_cache = get_catalog_schema_cache()
+    probe_executor = get_catalog_probe_executor()
+    entitlement_cache = get_entitlement_cache()
+    
+    def refresh():
+        try:
+            if prefetched is not None:
+                apps_df = prefetched.result()
+            else:
+                apps_df = fetch_streamlit_apps(session, role, tracker, schema_cache, probe_executor)
+        except Exception:
+            apps_df = None
+        
+        if apps_df is None:
+            # Keep serving the snapshot, but stop reporting it as refreshing. Its time-to-live
+            # is not renewed, so an old snapshot is retried once it expires.
+            cache.replace(cache_key, stale_snapshot._replace(stale=False))
+            return
+        
+        apps_df = apply_entitlements(apps_df, resolve_role_entitlements(session, role, entitlement_cache))
+        fresh, changed = publish_catalog(cache, cache_key, apps_df)
+        if changed:
+            save_catalog_snapshot_quietly(session, cache_key, fresh)
+    
+    future = get_background_executor().submit(refresh)
+    refreshes.set(cache_key, future)
+    return future
+
+class CatalogRefresher:
+    """
+    Process-wide daemon thread that re-fetches, on a schedule, every catalog a page has
+    read recently, and publishes a new snapshot only when the catalog content changed
+    """
+
+    def __init__(self, interval_seconds, idle_seconds, cache, tracker, schema_cache, probe_executor, entitlement_cache):
+        self.interval_seconds = interval_seconds
+        self.idle_seconds = idle_seconds
+        self.cache = cache
+        self.tracker = tracker
+        self.schema_cache = schema_cache
+        self.probe_executor = probe_executor
+        self.entitlement_cache = entitlement_cache
+        self._lock = threading.Lock()
+        self._targets = {}        # cache key -> (session, role, last read)
+        self._stop = threading.Event()
+        self.runs = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.last_run = None
+        self._thread = threading.Thread(target=self._run, name="catalog-refresher", daemon=True)
+        self._thread.start()
+
+    def register(self, cache_key, session, role):
+        """Keep the catalog for cache_key on the refresh schedule; called on every read"""
+        with self._lock:
+            self._targets[cache_key] = (session, role, time.monotonic())
+
+    def refresh(self, cache_key, session, role):
+        """Re-fetch one catalog and publish it; returns True if its content changed"""
+        try:
+            apps_df = fetch_streamlit_apps(session, role, self.tracker, self.schema_cache, self.probe_executor)
+        except Exception:
+            apps_df = None
+        
+        if apps_df is None:
+            # Every strategy failed; keep serving the last published snapshot
+            with self._lock:
+                self.failures += 1
+            return False
+        
+        apps_df = apply_entitlements(apps_df, resolve_role_entitlements(session, role, self.entitlement_cache))
+        snapshot, changed = publish_catalog(self.cache, cache_key, apps_df)
+        if changed:
+            save_catalog_snapshot_quietly(session, cache_key, snapshot)
+        with self._lock:
+            if changed:
+                self.changed += 1
+            else:
+                self.unchanged += 1
+        return changed
+
+    def refresh_all(self):
+        """Refresh every registered catalog, dropping the ones nobody has read for the idle period"""
+        now = time.monotonic()
+        with self._lock:
+            for cache_key, (_, _, last_read) in list(self._targets.items()):
+                if now - last_read > self.idle_seconds:
+                    del self._targets[cache_key]
+            targets = list(self._targets.items())
+        
+        for cache_key, (session, role, _) in targets:
+            if self._stop.is_set():
+                return
+            started = time.perf_counter()
+            self.refresh(cache_key, session, role)
+            record_phase(session, "background refresh", time.perf_counter() - started)
+        
+        with self._lock:
+            self.runs += 1
+            self.last_run = datetime.now()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.refresh_all()
+            except Exception:
+                # One bad round must not end the schedule
+                pass
+
+    def stats(self):
+        """Return refresh counters for display"""
+        with self._lock:
+            return {
+                "catalogs": len(self._targets),
+                "runs": self.runs,
+                "changed": self.changed,
+                "unchanged": self.unchanged,
+                "failures": self.failures,
+                "last_run": self.last_run
+            }
+
+@st.cache_resource
+def get_catalog_refresher():
+    """Process-wide background catalog refresher, started on first use"""
+    return CatalogRefresher(
+        CATALOG_REFRESH_INTERVAL_SECONDS, CATALOG_REFRESH_IDLE_SECONDS,
+        get_catalog_cache(), get_catalog_strategy_tracker(), get_catalog_schema_cache(),
+        get_catalog_probe_executor(), get_entitlement_cache()
+    )
+
+def get_cached_streamlit_apps(session, user_info, force_refresh=False, prefetched=None):
+    """
+    Get the Streamlit app catalog for the current role as a CatalogSnapshot, serving
+    the latest published snapshot from the catalog cache. The background refresher
+    keeps that snapshot current; if it has expired anyway, or the process just started,
+    the expired entry or last persisted snapshot is served immediately and revalidated
+    in the background. Each app's ACCESS_STATUS is set from the role's grants before
+    caching. prefetched is an optional future for a catalog load already started by
+    bootstrap_page.
+    """
+    cache = get_catalog_cache()
+    role = user_info['current_role']
+    cache_key = catalog_cache_key(user_info)
+    get_catalog_refresher().register(cache_key, session, role)
+    
+    if force_refresh:
+        cache.invalidate(cache_key)
+    
+    snapshot = cache.get(cache_key)
+    if snapshot is not None:
+        return snapshot
+    
+    # Stale-while-revalidate from the expired entry or the persisted snapshot
+    if not force_refresh:
+        snapshot = cache.get_stale(cache_key)
+        if snapshot is not None:
+            snapshot = snapshot._replace(stale=True)
+        else:
+            snapshot = load_catalog_snapshot(session, cache_key)
+        if snapshot is not None:
+            cache.set(cache_key, snapshot)
+            start_background_refresh(session, role, cache_key, snapshot, prefetched)
+            return snapshot
+    
+    if prefetched is not None:
+        apps_df = prefetched.result()
+    else:
+        apps_df = get_user_streamlit_apps(session, role=role)
+    if apps_df is None:
+        # Every strategy failed - show an empty catalog without caching it, so the next rerun retries
+        return CatalogSnapshot(pd.DataFrame(), datetime.now(), False)
+    
+    # Annotate before caching so grants are looked up once per catalog, not per rerun
+    apps_df = apply_entitlements(apps_df, resolve_role_entitlements(session, role, get_entitlement_cache()))
+    snapshot, changed = publish_catalog(cache, cache_key, apps_df)
+    
+    # An empty catalog is saved too, so a restart does not bring back apps that were dropped
+    if changed:
+        get_background_executor().submit(save_catalog_snapshot_quietly, session, cache_key, snapshot)
+    return snapshot
+
+def bootstrap_page(session):
+    """
+    Resolve the user context for this session. On the first load the user context
+    query is submitted asynchronously and, if the catalog cache is cold, the catalog
+    load starts at the same time so the two round trips overlap.
+    Returns (user_info, catalog_future) where catalog_future may be None.
+    """
+    user_info = st.session_state.get('user_info')
+    if user_info is not None:
+        return user_info, None
+    
+    user_job = session.sql(USER_CONTEXT_QUERY).collect_nowait()
+    
+    catalog_future = None
+    if not get_catalog_cache().has_fresh_entries():
+        catalog_future = get_bootstrap_executor().submit(
+            fetch_streamlit_apps, session, None,
+            get_catalog_strategy_tracker(), get_catalog_schema_cache(), get_catalog_probe_executor()
+        )
+    
+    user_info = get_current_user_info(session, user_job)
+    st.session_state['user_info'] = user_info
+    return user_info, catalog_future
+
+class EventRecorder:
+    """
+    Process-wide buffer of app launch events. record() only appends to memory; a
+    daemon thread writes the buffer with multi-row INSERTs when it holds max_events or
+    every flush_interval_seconds. Events that fail to write stay buffered for the next
+    flush, up to buffer_limit (the oldest are dropped beyond that).
+    """
+
+    def __init__(self, table, max_events, flush_interval_seconds, batch_rows, buffer_limit):
+        self.table = table
+        self.max_events = max_events
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_rows = batch_rows
+        self.buffer_limit = buffer_limit
+        self._session = None
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._table_ready = False
+        self.recorded = 0
+        self.flushed = 0
+        self.inserts = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+        self.last_flush = None
+        self._thread = threading.Thread(target=self._run, name="event-recorder", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def bind(self, session):
+        """Session used for flushing; set on every rerun"""
+        self._session = session
+
+    def record(self, event_type, user_info, app_keys):
+        """Buffer one event per (database, schema, app name) in app_keys"""
+        event_time = datetime.now().isoformat(sep=" ", timespec="milliseconds")
+        with self._lock:
+            for database, schema, name in app_keys:
+                self._buffer.append((event_time, event_type, user_info['username'], user_info['current_role'], database, schema, name))
+            self.recorded += len(app_keys)
+            self._trim()
+            full = len(self._buffer) >= self.max_events
+        if full:
+            self._wake.set()
+
+    def _trim(self):
+        """Drop the oldest events beyond buffer_limit; called with the lock held"""
+        while len(self._buffer) > self.buffer_limit:
+            self._buffer.popleft()
+            self.dropped += 1
+
+    def _insert_query(self, rows):
+        placeholders = "(" + ", ".join("?" for _ in EVENT_COLUMNS) + ")"
+        return f"INSERT INTO {self.table} ({', '.join(EVENT_COLUMNS)}) VALUES " + ", ".join([placeholders] * rows)
+
+    def flush(self):
+        """Write all buffered events in batches of batch_rows; returns the number written"""
+        session = self._session
+        if session is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                events = list(self._buffer)
+                self._buffer.clear()
+            if not events:
+                return 0
+            
+            written = 0
+            try:
+                if not self._table_ready:
+                    columns = ", ".join(f"{name} {data_type}" for name, data_type in EVENT_COLUMNS.items())
+                    session.sql(f"CREATE TABLE IF NOT EXISTS {self.table} ({columns})").collect()
+                    self._table_ready = True
+                for start in range(0, len(events), self.batch_rows):
+                    batch = events[start:start + self.batch_rows]
+                    session.sql(self._insert_query(len(batch)), params=[value for event in batch for value in event]).collect()
+                    written += len(batch)
+                    with self._lock:
+                        self.inserts += 1
+            except Exception:
+                # Keep what was not written, ahead of events recorded meanwhile
+                with self._lock:
+                    self.failed_flushes += 1
+                    self._buffer.extendleft(reversed(events[written:]))
+                    self._trim()
+            
+            with self._lock:
+                self.flushed += written
+                self.last_flush = datetime.now()
+            return written
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def stats(self):
+        """Return buffer and flush counters for display"""
+        with self._lock:
+            return {
+                "recorded": self.recorded,
+                "buffered": len(self._buffer),
+                "flushed": self.flushed,
+                "inserts": self.inserts,
+                "failed_flushes": self.failed_flushes,
+                "dropped": self.dropped,
+                "last_flush": self.last_flush
+            }
+
+@st.cache_resource
+def get_event_recorder():
+    """Process-wide usage event recorder, started on first use"""
+    return EventRecorder(
+        EVENTS_TABLE, EVENT_FLUSH_MAX_EVENTS, EVENT_FLUSH_INTERVAL_SECONDS,
+        EVENT_INSERT_BATCH_ROWS, EVENT_BUFFER_MAX_EVENTS
+    )
+
+def select_app_launch(app_key, user_info):
+    """
+    Record a launch when the user picks an app. The app then opens from a real link on
+    the user's next click; picking the same app again does not record a second launch.
+    """
+    if st.session_state.get('selected_launch') != app_key:
+        st.session_state['selected_launch'] = app_key
+        get_event_recorder().record("launch", user_info, [app_key])
+
+@st.cache_resource
+def get_popularity_cache():
+    """Process-wide role -> {qualified app name: score} cache"""
+    return TTLCache(POPULARITY_CACHE_TTL_SECONDS, POPULARITY_CACHE_MAX_ENTRIES)
+
+@st.cache_resource
+def get_ranked_catalogs():
+    """Process-wide role -> (catalog, ranking, catalog ordered by popularity) cache"""
+    return TTLCache(CATALOG_CACHE_TTL_SECONDS, CATALOG_CACHE_MAX_ENTRIES)
+
+def load_popularity(session, role):
+    """Aggregate the role's recent launches into a {qualified app name: score} ranking"""
+    since = (datetime.now() - timedelta(days=POPULARITY_WINDOW_DAYS)).isoformat(sep=" ")
+    rows = session.sql(POPULARITY_QUERY.format(table=EVENTS_TABLE), params=[role, since]).collect()
+    ranking = {}
+    for row in rows:
+        counts = {key.upper(): value for key, value in row.asDict().items()}
+        name = qualified_app_name(counts['DATABASE_NAME'], counts['SCHEMA_NAME'], counts['APP_NAME'])
+        ranking[name] = float(counts['LAUNCHES'] or 0)
+    return ranking
+
+def get_popularity_ranking(session, role):
+    """
+    Return the cached popularity ranking for a role without waiting: when it is missing
+    or expired it is recomputed in the background and the previous one (or none) is used.
+    """
+    cache = get_popularity_cache()
+    ranking = cache.get(role)
+    if ranking is not None:
+        return ranking
+    
+    refreshes = get_background_refreshes()
+    running = refreshes.get_stale(("popularity", role))
+    if running is None or running.done():
+        def compute():
+            try:
+                cache.set(role, load_popularity(session, role))
+            except Exception:
+                # No events table yet (or no access to it) - rank nothing until the next attempt
+                cache.set(role, {})
+        refreshes.set(("popularity", role), get_background_executor().submit(compute))
+    
+    stale = cache.get_stale(role)
+    return stale if stale is not None else {}
+
+def rank_by_popularity(apps_df, ranking, role):
+    """
+    Order apps by popularity score, most popular first, keeping the catalog order for ties.
+    The ordered frame is reused while the role's catalog and ranking are unchanged, so the
+    search index synced to it is not rebuilt on every rerun.
+    """
+    if not ranking or apps_df.empty or 'INTERNAL_NAME' not in apps_df.columns:
+        return apps_df
+    
+    ranked_catalogs = get_ranked_catalogs()
+    ranked = ranked_catalogs.get(role)
+    if ranked is not None and ranked[0] is apps_df and ranked[1] is ranking:
+        return ranked[2]
+    
+    scores = catalog_app_names(apps_df).map(ranking).fillna(0.0).to_numpy()
+    ranked_df = apps_df.iloc[np.argsort(-scores, kind="stable")].reset_index(drop=True)
+    ranked_catalogs.set(role, (apps_df, ranking, ranked_df))
+    return ranked_df
 
 def get_sample_apps():
     """
@@ -168,6 +1447,347 @@ def get_sample_apps():
     ])
 
 
+def tokenize_search_text(text):
+    """Split text into lower-case alphanumeric search tokens"""
+    return re.findall(r'[a-z0-9]+', str(text).lower())
+
+def within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or adjacent transposition"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+def deletion_variants(token):
+    """All strings obtained by deleting one character from token"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+class AppSearchIndex:
+    """
+    Inverted index over the app catalog with prefix and one-typo matching.
+    The index is kept in sync with catalog snapshots by comparing a hash of each row,
+    so an unchanged catalog costs nothing and a changed one only re-indexes the changed apps.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._source = None
+        self._documents = {}      # doc key -> indexed field values
+        self._row_hashes = {}     # doc key -> hash of the row the document was indexed from
+        self._postings = {}       # token -> {doc key: weight}
+        self._vocabulary = []     # sorted tokens, for prefix lookups
+        self._deletions = {}      # one-deletion variant -> tokens, for typo lookups
+        self._positions = {}      # doc key -> row position in the current snapshot
+        self._short_terms = {}    # short term -> {doc key: score}, cleared when the index changes
+
+    @staticmethod
+    def _document_keys(columns, row_count):
+        """Document key (database, schema, streamlit name) of every row, from {column: values}"""
+        def column(name):
+            return columns.get(name) or [''] * row_count
+        
+        names = [internal or app for internal, app in zip(column('INTERNAL_NAME'), column('APP_NAME'))]
+        return list(zip(column('DATABASE_NAME'), column('SCHEMA_NAME'), names))
+
+    def _add_document(self, key, fields):
+        self._documents[key] = fields
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            for token in tokenize_search_text(fields.get(field, '')):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._vocabulary, token)
+                    if len(token) >= SEARCH_TYPO_MIN_LENGTH:
+                        for variant in deletion_variants(token) | {token}:
+                            self._deletions.setdefault(variant, set()).add(token)
+                postings[key] = max(postings.get(key, 0.0), weight)
+
+    def _remove_document(self, key):
+        fields = self._documents.pop(key)
+        for field in SEARCH_FIELD_WEIGHTS:
+            for token in tokenize_search_text(fields.get(field, '')):
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[token]
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                    if len(token) >= SEARCH_TYPO_MIN_LENGTH:
+                        for variant in deletion_variants(token) | {token}:
+                            tokens = self._deletions.get(variant)
+                            if tokens is not None:
+                                tokens.discard(token)
+                                if not tokens:
+                                    del self._deletions[variant]
+
+    def _sync(self, apps_df):
+        """Bring the index up to date with a catalog snapshot, re-indexing only changed apps; called with the lock held"""
+        if apps_df is self._source:
+            return
+        
+        columns = [column for column in ['DATABASE_NAME', 'SCHEMA_NAME', 'INTERNAL_NAME', *SEARCH_FIELD_WEIGHTS] if column in apps_df.columns]
+        # Plain lists, not row dicts: only the rows whose hash changed are turned into documents
+        strings = apps_df[list(dict.fromkeys(columns))].fillna('').astype(str)
+        values = {column: strings[column].tolist() for column in strings.columns}
+        fields = [field for field in SEARCH_FIELD_WEIGHTS if field in values]
+        rows = list(zip(*(values[field] for field in fields)))
+        keys = self._document_keys(values, len(strings))
+        
+        # A key listed twice is indexed from its last row and ranked at its first
+        row_hashes = {key: hash(row) for key, row in zip(keys, rows)}
+        last_rows = dict(zip(keys, rows))
+        changed = [key for key, row_hash in row_hashes.items() if self._row_hashes.get(key) != row_hash]
+        removed = [key for key in self._documents if key not in row_hashes]
+        
+        for key in removed:
+            self._remove_document(key)
+        for key in changed:
+            if key in self._documents:
+                self._remove_document(key)
+            self._add_document(key, dict(zip(fields, last_rows[key])))
+        if changed or removed:
+            self._short_terms = {}
+        
+        self._row_hashes = row_hashes
+        self._positions = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+        self._source = apps_df
+
+    def _match_term(self, term):
+        """Return {doc key: score} for a single query term"""
+        if len(term) <= SEARCH_SHORT_TERM_LENGTH:
+            scores = self._short_terms.get(term)
+            if scores is None:
+                scores = self._short_terms[term] = self._expand_term(term)
+            return scores
+        return self._expand_term(term)
+
+    def _expand_term(self, term):
+        """Score every document matching term exactly, as a prefix or (for longer terms) with one typo"""
+        scores = {}
+        
+        def add(token, factor):
+            for key, weight in self._postings[token].items():
+                score = weight * factor
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+        
+        # Exact and prefix matches
+        start = bisect.bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            add(token, 1.0 if token == term else SEARCH_PREFIX_FACTOR)
+        
+        # Typo-tolerant matches (one edit) for longer terms
+        if len(term) >= SEARCH_TYPO_MIN_LENGTH:
+            candidates = set()
+            for variant in deletion_variants(term) | {term}:
+                candidates |= self._deletions.get(variant, set())
+            for token in candidates:
+                if token != term and within_one_edit(term, token):
+                    add(token, SEARCH_TYPO_FACTOR)
+        
+        return scores
+
+    def search(self, apps_df, query):
+        """
+        Return row positions in apps_df of matching apps, best match first. Every query term
+        must match. The index is synced to apps_df under the same lock, so sessions sharing
+        it never get positions for another session's frame.
+        """
+        terms = tokenize_search_text(query)
+        if not terms:
+            return None
+        
+        with self._lock:
+            self._sync(apps_df)
+            scores = None
+            for term in dict.fromkeys(terms):
+                term_scores = self._match_term(term)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+                if not scores:
+                    return []
+            
+            positions = self._positions
+            ranked = sorted((-score, positions[key]) for key, score in scores.items())
+            return [position for _, position in ranked]
+
+@st.cache_resource
+def get_search_indexes():
+    """Process-wide role -> AppSearchIndex cache"""
+    return TTLCache(CATALOG_CACHE_TTL_SECONDS, CATALOG_CACHE_MAX_ENTRIES)
+
+def search_apps(apps_df, query, role):
+    """Filter and rank apps_df by a search query using the role's search index"""
+    indexes = get_search_indexes()
+    index = indexes.get(role)
+    if index is None:
+        # An expired index is still reused, so it only re-indexes the apps that changed
+        index = indexes.get_stale(role) or AppSearchIndex()
+        indexes.set(role, index)
+    
+    positions = index.search(apps_df, query)
+    if positions is None:
+        return apps_df
+    return apps_df.iloc[positions]
+
+def add_launch_urls(apps_df):
+    """Add a LAUNCH_URL column built for the whole frame at once (None when no streamlit name is known)"""
+    apps_df = apps_df.copy()
+    if 'INTERNAL_NAME' not in apps_df.columns:
+        apps_df['LAUNCH_URL'] = None
+        return apps_df
+    
+    names = apps_df['INTERNAL_NAME']
+    has_name = names.notna() & (names != '') & (names != 'Unknown')
+    apps_df['LAUNCH_URL'] = (STREAMLIT_BASE_URL + "." + names.astype(str)).where(has_name, None)
+    return apps_df
+
+def paginate_apps(apps_df):
+    """Render the paging controls and return (page_df, page_number, page_count) for the current page"""
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Apps per page", options=APP_PAGE_SIZE_OPTIONS, index=0)
+    
+    page_count = max(1, -(-len(apps_df) // page_size))
+    with col2:
+        # The key changes with the result size so the page resets when a search narrows the list
+        page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key=f"app_page_{len(apps_df)}_{page_size}")
+    
+    start = (int(page_number) - 1) * page_size
+    return apps_df.iloc[start:start + page_size], int(page_number), page_count
+
+def render_app_table(page_df, user_info):
+    """
+    Render the current page of apps as a single table. Selecting a row records the launch
+    and shows the link that opens the app.
+    """
+    columns = ['APP_NAME', 'OWNER', 'DESCRIPTION', 'DATABASE_NAME', 'SCHEMA_NAME']
+    event = st.dataframe(
+        page_df[[column for column in columns if column in page_df.columns]],
+        column_config={
+            'APP_NAME': st.column_config.TextColumn("App"),
+            'OWNER': st.column_config.TextColumn("Owner"),
+            'DESCRIPTION': st.column_config.TextColumn("Description"),
+            'DATABASE_NAME': st.column_config.TextColumn("Database"),
+            'SCHEMA_NAME': st.column_config.TextColumn("Schema")
+        },
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row"
+    )
+    
+    rows = event.selection.rows
+    if not rows:
+        st.caption("Select an app to launch it")
+        return
+    app = page_df.iloc[rows[0]]
+    if pd.isna(app['LAUNCH_URL']):
+        st.caption(f"⚠️ No URL available for {app['APP_NAME']}")
+        return
+    select_app_launch((app['DATABASE_NAME'], app['SCHEMA_NAME'], app['INTERNAL_NAME']), user_info)
+    st.link_button(f"🚀 Open {app['APP_NAME']}", app['LAUNCH_URL'], type="primary")
+
+def render_app_cards(page_df, user_info):
+    """
+    Render the current page of apps as cards. The Launch button records the launch and
+    turns into the link that opens the app.
+    """
+    for idx, app in page_df.iterrows():
+        with st.container():
+            col1, col2 = st.columns([4, 1])
+            
+            with col1:
+                st.markdown(f"**🚀 {app['APP_NAME']}**")
+                st.caption(f"Owner: {app['OWNER']} | {app['DESCRIPTION']}")
+            
+            with col2:
+                if pd.notna(app['LAUNCH_URL']):
+                    app_key = (app['DATABASE_NAME'], app['SCHEMA_NAME'], app['INTERNAL_NAME'])
+                    if st.session_state.get('selected_launch') == app_key:
+                        # A real anchor, so the app opens in a new tab on the user's own click
+                        st.link_button("🚀 Open", app['LAUNCH_URL'], type="primary", use_container_width=True)
+                    else:
+                        st.button(
+                            "🚀 Launch",
+                            key=f"launch_{'.'.join(map(str, app_key))}",
+                            use_container_width=True,
+                            on_click=select_app_launch,
+                            args=(app_key, user_info)
+                        )
+                else:
+                    # No streamlit name available
+                    st.markdown(f"""
+                        <div style="
+                            display: inline-block;
+                            background-color: #cccccc;
+                            color: #666666;
+                            padding: 0.5rem 1rem;
+                            border-radius: 0.5rem;
+                            font-weight: 500;
+                            text-align: center;
+                            width: 100%;
+                            box-sizing: border-box;
+                        ">
+                            ⚠️ URL Not Available
+                        </div>
+                    """, unsafe_allow_html=True)
+            
+            st.divider()
+
+@st.fragment(run_every=SNAPSHOT_REFRESH_POLL_SECONDS)
+def watch_background_refresh(cache_key, refreshed_at):
+    """Poll the catalog's background refresh and rerun the page once fresh data has been published"""
+    refresh = get_background_refreshes().get_stale(cache_key)
+    if refresh is not None and refresh.done():
+        st.rerun()
+    st.caption(f"🕒 Last refreshed {refreshed_at:%Y-%m-%d %H:%M:%S} · refreshing in the background...")
+
+def render_latency_panel(metrics, user_info):
+    """Sidebar panel with query and phase latency histograms and recent records"""
+    with st.sidebar.expander("⏱️ Latency", expanded=True):
+        summary = metrics.summary()
+        if not summary:
+            st.caption("No measurements yet")
+            return
+        
+        st.dataframe(pd.DataFrame(summary), hide_index=True)
+        st.caption("Percentiles are histogram bucket upper bounds")
+        st.dataframe(pd.DataFrame(metrics.recent()[::-1]), hide_index=True)
+        
+        st.caption("App startup (this process)")
+        st.dataframe(pd.DataFrame(get_startup_timings().summary()), hide_index=True)
+        
+        # Only present when running outside Snowflake on the shared session pool
+        connection = init_connection()
+        if isinstance(connection, PooledSession):
+            st.caption("Session pool")
+            st.dataframe(pd.DataFrame([connection.pool.stats()]), hide_index=True)
+        
+        if user_info['current_role'].upper() in METRICS_EXPORT_ROLES:
+            st.download_button(
+                "⬇️ Export metrics (JSON)",
+                data=metrics.export_json(),
+                file_name=f"landing_page_metrics_{datetime.now():%Y%m%d_%H%M%S}.json",
+                mime="application/json"
+            )
+
 def main():
     """Main Streamlit application"""
     # Page configuration
@@ -179,98 +1799,119 @@ def main():
     
     # Header
     st.title("🚀 Streamlit Applications")
-    st.caption("Your accessible Streamlit applications")
+    header_col1, header_col2 = st.columns([4, 1])
+    with header_col1:
+        st.caption("Your accessible Streamlit applications")
+    with header_col2:
+        refresh_requested = st.button("🔄 Refresh", help="Reload the app catalog from Snowflake")
     
-    # Initialize connection
-    session = init_connection()
+    # Initialize connection - every session.sql call is timed for the latency debug panel
+    metrics = get_latency_metrics()
+    session = InstrumentedSession(init_connection(), metrics)
     
-    # Get current user info
-    user_info = get_current_user_info(session)
+    # Get current user info (resolved once per session, overlapping the first catalog load)
+    if refresh_requested:
+        st.session_state.pop('user_info', None)
+    user_info, catalog_future = bootstrap_page(session)
     
-    # Welcome message
+    # Welcome message - rendered as soon as the user context arrives, before the app list
     st.info(f"👋 **Welcome {user_info['username']}!** (Role: {user_info['current_role']})")
     
+    # Usage events are flushed in the background with this session
+    get_event_recorder().bind(session)
+    
     # Main content area
     with st.spinner("🔍 Loading your accessible Streamlit applications..."):
-        # Try to get real apps from Snowflake
-        apps_df = get_user_streamlit_apps(session)
+        # Try to get real apps from Snowflake (served from the catalog cache when fresh)
+        snapshot = get_cached_streamlit_apps(
+            session, user_info, force_refresh=refresh_requested, prefetched=catalog_future
+        )
+        apps_df = snapshot.apps_df
+        
+        # Most viewed apps for this role first (ranking computed in the background)
+        ranking = get_popularity_ranking(session, user_info['current_role'])
+        apps_df = rank_by_popularity(apps_df, ranking, user_info['current_role'])
         
         # If no real apps found, use sample data
         if apps_df.empty:
             st.info("No Streamlit applications found. Showing sample apps for demonstration.")
             apps_df = get_sample_apps()
     
+    # Last refreshed indicator - a snapshot being revalidated is swapped for fresh data when ready
+    if snapshot.stale:
+        watch_background_refresh(catalog_cache_key(user_info), snapshot.refreshed_at)
+    elif not snapshot.apps_df.empty:
+        st.caption(f"🕒 Last refreshed {snapshot.refreshed_at:%Y-%m-%d %H:%M:%S}")
+    
+    # Search across app name, owner, description, database and schema
+    if not apps_df.empty:
+        search_query = st.text_input(
+            "🔍 Search apps",
+            placeholder="Search by name, owner, description, database or schema"
+        )
+        if search_query.strip():
+            with metrics.phase("search"):
+                apps_df = search_apps(apps_df, search_query, user_info['current_role'])
+            if apps_df.empty:
+                st.info(f"No apps match '{search_query}'.")
+    
     # Simple apps list
     if not apps_df.empty:
-        for idx, app in apps_df.iterrows():
-            with st.container():
-                col1, col2 = st.columns([4, 1])
-                
-                with col1:
-                    st.markdown(f"**🚀 {app['APP_NAME']}**")
-                    st.caption(f"Owner: {app['OWNER']} | {app['DESCRIPTION']}")
-                
-                with col2:
-                    # Construct Snowflake Streamlit app URL using static base URL
-                    if app['INTERNAL_NAME'] and app['INTERNAL_NAME'] != 'Unknown':
-                        try:
-                            # Static base URL for your Snowflake environment
-                            base_url = "https://app.snowflake.com/sfsenorthamerica/demo387/#/streamlit-apps/STREAMLIT_APPS.LANDING_PAGE"
-                            
-                            # Get the actual streamlit name
-                            streamlit_name = app['INTERNAL_NAME']
-                            
-                            # Construct the full URL by appending the streamlit name
-                            full_url = f"{base_url}.{streamlit_name}"
-                            
-                            # Create clickable launch link
-                            st.markdown(f"""
-                                <a href="{full_url}" target="_blank" style="
-                                    display: inline-block;
-                                    background-color: #ff4b4b;
-                                    color: white;
-                                    padding: 0.5rem 1rem;
-                                    text-decoration: none;
-                                    border-radius: 0.5rem;
-                                    font-weight: 500;
-                                    text-align: center;
-                                    width: 100%;
-                                    box-sizing: border-box;
-                                ">
-                                    🚀 Launch
-                                </a>
-                            """, unsafe_allow_html=True)
-                            
-                        except Exception as e:
-                            # Fallback to regular button if URL construction fails
-                            if st.button("Launch", key=f"launch_{idx}", type="primary"):
-                                st.error("Unable to construct app URL")
-                    else:
-                        # No streamlit name available
-                        st.markdown(f"""
-                            <div style="
-                                display: inline-block;
-                                background-color: #cccccc;
-                                color: #666666;
-                                padding: 0.5rem 1rem;
-                                border-radius: 0.5rem;
-                                font-weight: 500;
-                                text-align: center;
-                                width: 100%;
-                                box-sizing: border-box;
-                            ">
-                                ⚠️ URL Not Available
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                
-                st.divider()
+        # Large catalogs default to the table view
+        view_mode = st.radio(
+            "View",
+            options=["Cards", "Table"],
+            index=0 if len(apps_df) <= CARD_VIEW_MAX_APPS else 1,
+            horizontal=True
+        )
+        page_df, page_number, page_count = paginate_apps(apps_df)
+        
+        with metrics.phase("render"):
+            page_df = add_launch_urls(page_df)
+            if view_mode == "Table":
+                render_app_table(page_df, user_info)
+            else:
+                render_app_cards(page_df, user_info)
+        
+        st.caption(f"Page {page_number} of {page_count} | {len(apps_df)} apps")
     else:
         st.warning("No Streamlit applications found.")
     
+    # Catalog cache statistics
+    with st.sidebar.expander("📦 Catalog cache"):
+        cache_stats = get_catalog_cache().stats()
+        st.write(f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']}")
+        st.write(f"Hit rate: {cache_stats['hit_rate']:.0%}")
+        st.write(f"Entries: {cache_stats['entries']} / {CATALOG_CACHE_MAX_ENTRIES} (evictions: {cache_stats['evictions']})")
+        st.caption(f"Entries expire after {CATALOG_CACHE_TTL_SECONDS} seconds")
+        refresh_stats = get_catalog_refresher().stats()
+        st.write(
+            f"Background refresh: {refresh_stats['runs']} runs | "
+            f"{refresh_stats['changed']} changed | {refresh_stats['unchanged']} unchanged | "
+            f"{refresh_stats['failures']} failed"
+        )
+        st.caption(f"{refresh_stats['catalogs']} catalogs refreshed every {CATALOG_REFRESH_INTERVAL_SECONDS} seconds")
+    
+    # Usage event recorder
+    with st.sidebar.expander("📈 Usage events"):
+        event_stats = get_event_recorder().stats()
+        st.write(f"Recorded: {event_stats['recorded']} | Buffered: {event_stats['buffered']}")
+        st.write(f"Written: {event_stats['flushed']} in {event_stats['inserts']} inserts (failed flushes: {event_stats['failed_flushes']}, dropped: {event_stats['dropped']})")
+        st.caption(f"Flushed to {EVENTS_TABLE} every {EVENT_FLUSH_INTERVAL_SECONDS} seconds or {EVENT_FLUSH_MAX_EVENTS} events")
+    
+    # Catalog strategy health
+    with st.sidebar.expander("🧭 Catalog strategies"):
+        remembered = get_catalog_strategy_tracker().remembered(user_info['current_role'])
+        st.write(f"Remembered for this role: {remembered or 'none yet'}")
+        st.dataframe(pd.DataFrame(get_catalog_strategy_tracker().stats()), hide_index=True)
+    
+    # Opt-in latency debug panel
+    if st.sidebar.checkbox("🐞 Show latency debug panel"):
+        render_latency_panel(metrics, user_info)
+    
     # Simple footer
     st.markdown("---")
     st.caption("🚀 Streamlit Applications Landing Page | Powered by Snowflake")
 
 if __name__ == "__main__":
-    main()
+    run_app("streamlit_landing_page", main)